@@ -0,0 +1,153 @@
+"""
+Headless batch evaluation of adsorption isotherms.
+
+Reads a sweep definition (CSV, Parquet or YAML) with one row per simulation
+and writes every evaluated isotherm point to a Parquet file:
+
+    python batch.py sweep.yaml -o results.parquet --points 100 --workers 8
+
+Required columns: model, T, deltaH, deltaS, qmax. Optional columns: material,
+surface_area (m²/g, default 1000), P_max (bar, default 1), n, C, b.
+BET rows use p0 = P_max, so their pressures stop at grids.BET_CUTOFF * P_max.
+A YAML sweep is either a list of rows or a mapping with "rows" and optional
+"defaults" applied to every row.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+from grids import BET_CUTOFF
+from isotherms import MODELS, isotherm
+from thermo import equilibrium_constant
+
+REQUIRED_COLUMNS = ["model", "T", "deltaH", "deltaS", "qmax"]
+DEFAULTS = {"material": "", "surface_area": 1000.0, "P_max": 1.0, "n": 2.0, "C": 10.0, "b": 100.0}
+
+OUTPUT_SCHEMA = pa.schema([
+    ("run", pa.int64()),
+    ("model", pa.string()),
+    ("material", pa.string()),
+    ("temperature_K", pa.float64()),
+    ("pressure_bar", pa.float64()),
+    ("adsorption_mol_kg", pa.float64()),
+])
+
+
+def read_sweep(path: str) -> pd.DataFrame:
+    """
+    Load a sweep definition and fill in default values for optional columns.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        sweep = pd.read_csv(path)
+    elif suffix in (".parquet", ".pq"):
+        sweep = pq.read_table(path).to_pandas()
+    elif suffix in (".yaml", ".yml"):
+        with open(path) as f:
+            spec = yaml.safe_load(f)
+        if isinstance(spec, dict):
+            defaults = spec.get("defaults", {})
+            rows = [{**defaults, **row} for row in spec.get("rows", [])]
+        else:
+            rows = spec
+        sweep = pd.DataFrame(rows)
+    else:
+        raise ValueError(f"Unsupported sweep format: {suffix}")
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in sweep.columns]
+    if missing:
+        raise ValueError(f"Sweep is missing required columns: {', '.join(missing)}")
+    unknown = set(sweep["model"]) - set(MODELS)
+    if unknown:
+        raise ValueError(f"Unknown isotherm models in sweep: {', '.join(sorted(map(str, unknown)))}")
+
+    for col, value in DEFAULTS.items():
+        if col not in sweep.columns:
+            sweep[col] = value
+        else:
+            sweep[col] = sweep[col].fillna(value)
+    sweep["material"] = sweep["material"].astype(str)
+    return sweep.reset_index(drop=True)
+
+
+def evaluate_chunk(chunk: pd.DataFrame, points: int) -> pa.Table:
+    """
+    Evaluate every row of a sweep chunk, one broadcast call per model.
+    """
+    fractions = np.linspace(0.0, 1.0, points)
+    q = np.empty((len(chunk), points))
+    P_max = chunk["P_max"].to_numpy(float)[:, None]
+    models = chunk["model"].to_numpy()
+    # BET diverges at p0 = P_max, so its rows end just short of it
+    pressures = np.where(models[:, None] == "BET", BET_CUTOFF * P_max, P_max) * fractions
+
+    T = chunk["T"].to_numpy(float)[:, None]
+    K = equilibrium_constant(T, chunk["deltaH"].to_numpy(float)[:, None], chunk["deltaS"].to_numpy(float)[:, None])
+    scale = chunk["surface_area"].to_numpy(float)[:, None] / 1000.0
+    qmax = chunk["qmax"].to_numpy(float)[:, None] * scale
+
+    for model in np.unique(models):
+        rows = models == model
+        q[rows] = isotherm(model, pressures[rows], K[rows], qmax[rows],
+                           n=chunk["n"].to_numpy(float)[rows, None],
+                           C=chunk["C"].to_numpy(float)[rows, None],
+                           b=chunk["b"].to_numpy(float)[rows, None],
+                           T=T[rows], p0=P_max[rows])
+
+    return pa.table({
+        "run": np.repeat(chunk.index.to_numpy(np.int64), points),
+        "model": np.repeat(models.astype(str), points),
+        "material": np.repeat(chunk["material"].to_numpy(str), points),
+        "temperature_K": np.repeat(T[:, 0], points),
+        "pressure_bar": pressures.ravel(),
+        "adsorption_mol_kg": q.ravel(),
+    }, schema=OUTPUT_SCHEMA)
+
+
+def run_sweep(sweep: pd.DataFrame, output: str, points: int = 100, workers: int | None = None,
+              chunk_size: int = 10_000) -> int:
+    """
+    Evaluate a sweep in a process pool and stream the results to a Parquet file.
+
+    Returns the number of rows written.
+    """
+    chunks = [sweep.iloc[start:start + chunk_size] for start in range(0, len(sweep), chunk_size)]
+    written = 0
+    with pq.ParquetWriter(output, OUTPUT_SCHEMA, compression="zstd") as writer:
+        if workers == 1:
+            results = (evaluate_chunk(chunk, points) for chunk in chunks)
+            for table in results:
+                writer.write_table(table)
+                written += table.num_rows
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for table in pool.map(evaluate_chunk, chunks, [points] * len(chunks)):
+                    writer.write_table(table)
+                    written += table.num_rows
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate an isotherm parameter sweep without the UI.")
+    parser.add_argument("sweep", help="Sweep definition (.csv, .parquet or .yaml)")
+    parser.add_argument("-o", "--output", default="isotherms.parquet", help="Output Parquet file")
+    parser.add_argument("--points", type=int, default=100, help="Pressure points per isotherm")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Sweep rows per worker task")
+    args = parser.parse_args(argv)
+
+    sweep = read_sweep(args.sweep)
+    written = run_sweep(sweep, args.output, points=args.points, workers=args.workers,
+                        chunk_size=args.chunk_size)
+    print(f"Wrote {written} isotherm points from {len(sweep)} runs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Fixed-bed breakthrough simulation for the VOC removal case study.
+
+The bed is modelled with axial dispersion and a linear driving force (LDF)
+uptake rate towards a Langmuir isotherm. For the adsorbents of the case
+study the bed holds 10⁴-10⁶ times more VOC on the solid than in the gas, so
+the LDF amounts to tens of thousands of transfer units: gas and solid are
+close to local equilibrium and integrating the exchange between them
+explicitly only adds a ~1e13 stiffness ratio. The model is therefore solved
+in its equilibrium-dispersive form: the LDF resistance is lumped into the
+axial dispersion by matching the second moment of the response,
+1/Pe_eff = 1/Pe + 1/N with N = k_LDF t_stoich, and the column is a chain of
+Pe_eff/2 well-mixed cells, whose upwind transport disperses exactly like
+Pe_eff. The cell equations have a lower bidiagonal Jacobian and are
+integrated with LSODA.
+
+Variables are normalized: x = c / c0 in the gas, the solid follows the
+normalized Langmuir isotherm y*(x) = q*(c0 x) / q*(c0), and time is measured
+in stoichiometric times.
+"""
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from case_engine import PPM_TO_MOL_M3
+
+# Fraction of the inlet concentration that defines breakthrough
+BREAKTHROUGH_FRACTION = 0.05
+
+
+def _bed_system(n_cells, residence_time, t_stoich, capacity_ratio, K_c0):
+    """
+    Right-hand side and banded Jacobian of the cells-in-series equations in
+    stoichiometric time: (1 + capacity_ratio·y*'(x_i)) dx_i/dτ = a (x_(i-1) - x_i).
+    """
+    a = t_stoich / residence_time * n_cells
+
+    def holdup(x):
+        # Gas plus equilibrium solid capacity per unit change of x
+        return 1 + capacity_ratio * (1 + K_c0) / (1 + K_c0 * x) ** 2
+
+    def inflow(x):
+        upstream = np.empty_like(x)
+        upstream[0] = 1.0
+        upstream[1:] = x[:-1]
+        return upstream
+
+    def rhs(t, x):
+        return a * (inflow(x) - x) / holdup(x)
+
+    def jac(t, x):
+        # LSODA band storage (lband=1, uband=0): row 0 is the diagonal,
+        # row 1 the subdiagonal shifted to the column it belongs to.
+        h = holdup(x)
+        dh = -2 * capacity_ratio * K_c0 * (1 + K_c0) / (1 + K_c0 * x) ** 3
+        bands = np.empty((2, len(x)))
+        bands[0] = -a / h - a * (inflow(x) - x) * dh / h**2
+        bands[1, :-1] = a / h[1:]
+        bands[1, -1] = 0.0
+        return bands
+
+    return rhs, jac
+
+
+def simulate_breakthrough(residence_time: float, k_ldf: float, qmax: float, b: float,
+                          inlet_ppm: float, *, porosity: float = 0.4, particle_density: float = 750.0,
+                          peclet: float = 200.0, n_times: int = 400,
+                          rtol: float = 1e-4, atol: float = 1e-6) -> dict:
+    """
+    Simulate the outlet concentration of a fixed bed fed with a constant VOC inlet.
+
+    `residence_time` is the gas contact time (s), `k_ldf` the LDF rate constant
+    (1/s), `qmax` (mol/kg) and `b` (m³/mol) the Langmuir parameters and
+    `inlet_ppm` the feed concentration. Returns the time axis (s), the outlet
+    ratio C/C0, the breakthrough time at BREAKTHROUGH_FRACTION, the
+    stoichiometric time, the bed utilization at breakthrough and the number
+    of LDF transfer units N = k_ldf t_stoich.
+    """
+    c0 = inlet_ppm * PPM_TO_MOL_M3
+    q0 = qmax * b * c0 / (1 + b * c0)
+    # Solid-to-gas capacity ratio at feed conditions
+    capacity_ratio = (1 - porosity) / porosity * particle_density * q0 / c0
+    t_stoich = residence_time * (1 + capacity_ratio)
+    transfer_units = k_ldf * t_stoich
+    n_cells = max(int(round(0.5 / (1 / peclet + 1 / transfer_units))), 1)
+
+    rhs, jac = _bed_system(n_cells, residence_time, t_stoich, capacity_ratio, b * c0)
+    tau_end = 2.5
+    tau = np.linspace(0, tau_end, n_times)
+    solution = solve_ivp(rhs, (0, tau_end), np.zeros(n_cells), method="LSODA", jac=jac,
+                         lband=1, uband=0, t_eval=tau, rtol=rtol, atol=atol)
+    if not solution.success:
+        raise RuntimeError(f"Breakthrough integration failed: {solution.message}")
+
+    times = tau * t_stoich
+    outlet = np.clip(solution.y[-1], 0.0, None)
+    above = np.flatnonzero(outlet >= BREAKTHROUGH_FRACTION)
+    if above.size:
+        i = above[0]
+        t_break = np.interp(BREAKTHROUGH_FRACTION, outlet[i - 1:i + 1], times[i - 1:i + 1]) if i else 0.0
+    else:
+        t_break = np.nan
+
+    # Fraction of the equilibrium capacity used when the bed is taken off-line
+    window = times <= t_break
+    removed = np.trapezoid(1 - outlet[window], times[window]) if window.any() else 0.0
+    return {
+        "time": times,
+        "outlet": outlet,
+        "breakthrough_time": t_break,
+        "stoichiometric_time": t_stoich,
+        "bed_utilization": removed / t_stoich if np.isfinite(t_break) else np.nan,
+        "transfer_units": transfer_units,
+    }
@@ -0,0 +1,295 @@
+"""
+Local HTTP API for the isotherm, K(T) and case-study calculations.
+
+Endpoints (JSON request and response bodies):
+
+- POST /isotherm: model, pressure, T, deltaH, deltaS and optionally qmax,
+  n, C, b, p0 -> K and q
+- POST /equilibrium-constant: T, deltaH, deltaS -> K, lnK, dK_dT
+- POST /case/<calculator>: the inputs of a `case_engine` calculator
+  (gas_storage, water_treatment, air_purification, carbon_capture) -> its outputs
+- GET /health: request and batch counters
+
+Any numeric field may be a number or a list; the fields of one request are
+broadcast against each other and the outputs have the broadcast shape.
+
+Requests are micro-batched: requests for the same calculation (and model or
+calculator) that arrive within BATCH_WINDOW seconds are flattened into one
+set of columns, evaluated with a single vectorized call and split back into
+per-request responses, so thousands of tiny requests cost a few NumPy calls
+rather than thousands. Start the service with
+
+    python compute_api.py --port 8600
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+
+import numpy as np
+import tornado.web
+
+import case_engine
+from isotherms import MODELS, isotherm
+from thermo import dK_dT, equilibrium_constant, ln_equilibrium_constant
+
+API_PORT = int(os.environ.get("API_PORT", "8600"))
+API_ADDR = os.environ.get("API_ADDR", "127.0.0.1")
+BATCH_WINDOW = float(os.environ.get("API_BATCH_WINDOW", "0.002"))  # seconds
+MAX_BATCH_POINTS = 1_000_000  # a batch is evaluated early once it reaches this many points
+MAX_REQUEST_POINTS = 100_000
+LISTEN_BACKLOG = 1024  # pending connections; bursts of small requests exceed the default of 128
+
+CASE_CALCULATORS = {name: getattr(case_engine, name)
+                    for name in ("gas_storage", "water_treatment", "air_purification", "carbon_capture")}
+
+
+class MicroBatcher:
+    """
+    Collect requests per group for a short window and evaluate them in one call.
+
+    `kernel(group, **columns)` receives equally long 1-D float columns and
+    returns a dict of output columns of the same length.
+    """
+
+    def __init__(self, kernel, window: float = BATCH_WINDOW, max_points: int = MAX_BATCH_POINTS):
+        self.kernel = kernel
+        self.window = window
+        self.max_points = max_points
+        self.requests = 0
+        self.batches = 0
+        self._pending = {}  # group -> [(columns, shape, future)]
+        self._points = {}
+        self._timers = {}
+
+    def submit(self, group, fields: dict) -> asyncio.Future:
+        """
+        Queue one request and return a future resolving to its output arrays.
+        """
+        arrays = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in fields.values()))
+        shape = arrays[0].shape
+        if arrays[0].size > MAX_REQUEST_POINTS:
+            raise ValueError(f"At most {MAX_REQUEST_POINTS:,} points per request")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        columns = {name: array.ravel() for name, array in zip(fields, arrays)}
+        self._pending.setdefault(group, []).append((columns, shape, future))
+        self._points[group] = self._points.get(group, 0) + arrays[0].size
+        self.requests += 1
+        if self._points[group] >= self.max_points:
+            self.flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.window, self.flush, group)
+        return future
+
+    def flush(self, group):
+        """
+        Evaluate every queued request of a group and resolve their futures.
+
+        If the batched call raises, the requests are evaluated one by one so
+        that only the requests that fail on their own receive the error.
+        """
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._pending.pop(group, [])
+        self._points.pop(group, None)
+        if not queue:
+            return
+        self.batches += 1
+        try:
+            self._evaluate(group, queue)
+        except Exception as exc:
+            if len(queue) == 1:
+                if not queue[0][2].done():
+                    queue[0][2].set_exception(exc)
+                return
+            for item in queue:
+                try:
+                    self._evaluate(group, [item])
+                except Exception as item_exc:
+                    if not item[2].done():
+                        item[2].set_exception(item_exc)
+
+    def _evaluate(self, group, queue):
+        """
+        Run the kernel on the concatenated columns of `queue` and resolve its futures.
+        """
+        columns = {name: np.concatenate([item[0][name] for item in queue]) for name in queue[0][0]}
+        with np.errstate(all="ignore"):
+            outputs = self.kernel(group, **columns)
+        sizes = [int(np.prod(shape)) for _, shape, _ in queue]
+        offsets = np.cumsum(sizes)[:-1]
+        parts = {name: np.split(np.broadcast_to(values, (sum(sizes),)), offsets) for name, values in outputs.items()}
+        for i, (_, shape, future) in enumerate(queue):
+            if not future.done():
+                future.set_result({name: split[i].reshape(shape) for name, split in parts.items()})
+
+
+def isotherm_kernel(model, *, pressure, T, deltaH, deltaS, qmax, n, C, b, p0):
+    K = equilibrium_constant(T, deltaH, deltaS)
+    return {"K": K, "q": isotherm(model, pressure, K, qmax, n=n, C=C, b=b, T=T, p0=p0)}
+
+
+def equilibrium_kernel(_, *, T, deltaH, deltaS):
+    return {"K": equilibrium_constant(T, deltaH, deltaS), "lnK": ln_equilibrium_constant(T, deltaH, deltaS),
+            "dK_dT": dK_dT(T, deltaH, deltaS)}
+
+
+def case_kernel(name, **inputs):
+    return CASE_CALCULATORS[name](**inputs)
+
+
+def _to_json(values: np.ndarray):
+    """
+    Nested lists (or a number) with non-finite values as null.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 0:
+        return float(values) if np.isfinite(values) else None
+    converted = values.astype(object)
+    converted[~np.isfinite(values)] = None
+    return converted.tolist()
+
+
+def _fields(body: dict, required, defaults: dict) -> dict:
+    missing = [name for name in required if name not in body]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    unknown = set(body) - set(required) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return {name: body.get(name, defaults.get(name)) for name in (*required, *defaults)}
+
+
+class RequestError(tornado.web.HTTPError):
+    """
+    Client error whose message is returned in the JSON body.
+
+    The message is kept out of the HTTP reason phrase, which Tornado replaces
+    when it contains characters such as "<".
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(status_code)
+        self.message = message
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def write_error(self, status_code, **kwargs):
+        exc = kwargs.get("exc_info", (None, None, None))[1]
+        self.finish({"error": exc.message if isinstance(exc, RequestError) else self._reason})
+
+    def body(self) -> dict:
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except json.JSONDecodeError as exc:
+            raise RequestError(400, f"Invalid JSON: {exc}")
+        if not isinstance(body, dict):
+            raise RequestError(400, "Expected a JSON object")
+        return body
+
+    async def evaluate(self, batcher: MicroBatcher, group, fields: dict):
+        try:
+            outputs = await batcher.submit(group, fields)
+        except (TypeError, ValueError) as exc:
+            raise RequestError(400, str(exc))
+        self.finish({name: _to_json(values) for name, values in outputs.items()})
+
+
+class IsothermHandler(BaseHandler):
+    REQUIRED = ("pressure", "T", "deltaH", "deltaS")
+    DEFAULTS = {"qmax": 1.0, "n": 2.0, "C": 10.0, "b": 100.0, "p0": None}
+
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    async def post(self):
+        body = self.body()
+        model = body.pop("model", None)
+        if model not in MODELS:
+            raise RequestError(400, f"model must be one of {', '.join(MODELS)}")
+        try:
+            fields = _fields(body, self.REQUIRED, self.DEFAULTS)
+            if fields["p0"] is None:
+                # As in the app, BET defaults p0 to the largest requested pressure.
+                fields["p0"] = float(np.max(np.asarray(fields["pressure"], dtype=float)))
+        except (TypeError, ValueError) as exc:
+            raise RequestError(400, str(exc))
+        await self.evaluate(self.batcher, model, fields)
+
+
+class EquilibriumConstantHandler(BaseHandler):
+    REQUIRED = ("T", "deltaH", "deltaS")
+
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    async def post(self):
+        try:
+            fields = _fields(self.body(), self.REQUIRED, {})
+        except ValueError as exc:
+            raise RequestError(400, str(exc))
+        await self.evaluate(self.batcher, None, fields)
+
+
+class CaseHandler(BaseHandler):
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    async def post(self, name):
+        if name not in CASE_CALCULATORS:
+            raise RequestError(404, f"Unknown calculator {name!r}; "
+                                    f"available: {', '.join(CASE_CALCULATORS)}")
+        parameters = inspect.signature(CASE_CALCULATORS[name]).parameters.values()
+        required = [p.name for p in parameters if p.default is inspect.Parameter.empty]
+        defaults = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+        try:
+            fields = _fields(self.body(), required, defaults)
+        except ValueError as exc:
+            raise RequestError(400, str(exc))
+        await self.evaluate(self.batcher, name, fields)
+
+
+class HealthHandler(BaseHandler):
+    def initialize(self, batchers):
+        self.batchers = batchers
+
+    def get(self):
+        self.finish({"status": "ok", **{name: {"requests": batcher.requests, "batches": batcher.batches}
+                                        for name, batcher in self.batchers.items()}})
+
+
+def make_app(window: float = BATCH_WINDOW) -> tornado.web.Application:
+    """
+    The API application with one micro-batcher per calculation.
+    """
+    batchers = {"isotherm": MicroBatcher(isotherm_kernel, window),
+                "equilibrium_constant": MicroBatcher(equilibrium_kernel, window),
+                "case": MicroBatcher(case_kernel, window)}
+    return tornado.web.Application([
+        (r"/isotherm", IsothermHandler, {"batcher": batchers["isotherm"]}),
+        (r"/equilibrium-constant", EquilibriumConstantHandler, {"batcher": batchers["equilibrium_constant"]}),
+        (r"/case/(\w+)", CaseHandler, {"batcher": batchers["case"]}),
+        (r"/health", HealthHandler, {"batchers": batchers}),
+    ])
+
+
+async def serve(port: int, address: str, window: float):
+    make_app(window).listen(port, address=address, backlog=LISTEN_BACKLOG)
+    print(f"Compute API listening on http://{address}:{port} (batch window {window * 1000:g} ms)")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the isotherm and case-study calculations over HTTP.")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Port to listen on")
+    parser.add_argument("--address", default=API_ADDR, help="Address to bind")
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW, help="Micro-batching window in seconds")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.port, args.address, args.window))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,30 @@
+from contextlib import nullcontext
 import streamlit as st
-import importlib
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from metrics import page_timer, start_metrics_server, track_session
+from page_registry import PAGES, load_page, warm_pages
+from tracing import TRACE_RERUNS, TRACE_TOGGLE_KEY, record
 
-# Define available pages and corresponding module names
-PAGES = {
-    "Learning Objectives": "learning_objectives",
-    "Theory": "theory",
-    "Simulation": "simulation",
-    "Model Recommendation": "model_recommendation", 
-    #"Data Analysis": "data_analysis",
-    "Case Studies": "case_studies",
-    "Quiz": "quiz"
-}
+start_metrics_server()
+ctx = get_script_run_ctx()
+if ctx is not None:
+    track_session(ctx.session_id)
 
 st.sidebar.title("Navigation")
 selection = st.sidebar.radio("Go to", list(PAGES.keys()))
+trace_rerun = TRACE_RERUNS or st.sidebar.toggle("Record Performance Trace", key=TRACE_TOGGLE_KEY,
+                                                help="Write a Chrome trace of each rerun for chrome://tracing or Perfetto.")
 
-# Dynamically import the module and run its app() function
+# Import the selected page on first use and run its app() function
 module_name = PAGES[selection]
-module = importlib.import_module(module_name)
-module.app()
\ No newline at end of file
+with record(selection) if trace_rerun else nullcontext() as trace, page_timer(selection):
+    module = load_page(module_name)
+    module.app()
+
+if trace is not None:
+    st.sidebar.caption(f"Trace written to {trace.path}")
+    st.sidebar.download_button("Download Trace", trace.to_json(), file_name=trace.path.name,
+                               mime="application/json")
+
+# After the first page has rendered, import the remaining pages in the background
+warm_pages(PAGES.values())
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Chunked export of simulation results to gzip CSV, Parquet and Arrow IPC.
+
+Results are turned into Arrow record batches one chunk at a time and written
+straight into the output sink, so an export never holds more than the
+compressed output plus one chunk of rows in memory.
+"""
+import io
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 65_536
+
+FORMATS = {
+    "CSV (gzip)": {"extension": "csv.gz", "mime": "application/gzip"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+    "Arrow IPC": {"extension": "arrow", "mime": "application/vnd.apache.arrow.file"},
+}
+
+
+def column_batches(columns: dict, chunk_rows: int = CHUNK_ROWS):
+    """
+    Yield record batches from equal-length 1-D columns; scalars are broadcast.
+    """
+    length = max((np.size(col) for col in columns.values() if np.ndim(col)), default=1)
+    columns = {name: np.broadcast_to(np.asarray(col), (length,)) for name, col in columns.items()}
+    for start in range(0, length, chunk_rows):
+        yield pa.record_batch({name: np.ascontiguousarray(col[start:start + chunk_rows])
+                               for name, col in columns.items()})
+
+
+def grid_batches(x: np.ndarray, y: np.ndarray, z: np.ndarray, names: tuple, scale: float = 1.0,
+                 chunk_rows: int = CHUNK_ROWS):
+    """
+    Yield a 2-D grid z[len(y), len(x)] in long form without building a meshgrid.
+
+    `scale` multiplies z chunk by chunk, so the full grid is never copied.
+    """
+    flat = z.reshape(-1)
+    for start in range(0, flat.size, chunk_rows):
+        index = np.arange(start, min(start + chunk_rows, flat.size))
+        yield pa.record_batch({names[0]: x[index % len(x)],
+                               names[1]: y[index // len(x)],
+                               names[2]: flat[index] * scale})
+
+
+def write_export(batches, fmt: str, sink):
+    """
+    Write record batches to a path or binary file object in the given format.
+
+    The schema is taken from the first batch, so at least one batch is required.
+    """
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        raise ValueError("Nothing to export: no record batches")
+    if fmt == "CSV (gzip)":
+        with pa.CompressedOutputStream(sink, "gzip") as stream, \
+                pacsv.CSVWriter(stream, first.schema) as writer:
+            writer.write_batch(first)
+            for batch in batches:
+                writer.write_batch(batch)
+    elif fmt == "Parquet":
+        with pq.ParquetWriter(sink, first.schema, compression="zstd") as writer:
+            writer.write_batch(first)
+            for batch in batches:
+                writer.write_batch(batch)
+    elif fmt == "Arrow IPC":
+        with pa.ipc.new_file(sink, first.schema) as writer:
+            writer.write_batch(first)
+            for batch in batches:
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+class _OpenBytesIO(io.BytesIO):
+    """
+    BytesIO that stays readable after the writers close their sink.
+    """
+
+    def close(self):
+        pass
+
+
+def export_bytes(batches, fmt: str) -> bytes:
+    """
+    Serialize record batches into bytes ready for a download button.
+
+    The output is written into a BytesIO, whose getvalue() hands over its
+    internal bytes object instead of copying it, so the file exists once.
+    """
+    buffer = _OpenBytesIO()
+    write_export(batches, fmt, pa.PythonFile(buffer, mode="w"))
+    return buffer.getvalue()
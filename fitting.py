@@ -0,0 +1,318 @@
+"""
+Nonlinear least-squares fitting of adsorption isotherms.
+
+All models are fitted with a Levenberg-Marquardt solver that runs on a whole
+batch of independent datasets at once: residuals and analytic Jacobians are
+evaluated as (datasets, points) arrays and the damped normal equations are
+solved with one batched `np.linalg.solve` per iteration. Parameters are
+fitted in log space, which keeps them positive and well scaled. Initial
+guesses come from the linearized forms described on the Theory page.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from thermo import R
+
+
+def _langmuir(p, params, T, p0):
+    # q = qmax * K p / (1 + K p)
+    qmax, K = params[:, 0:1], params[:, 1:2]
+    denom = 1 + K * p
+    theta = K * p / denom
+    jac = np.stack([theta, qmax * p / denom**2], axis=-1)
+    return qmax * theta, jac
+
+
+def _langmuir_theta(p, params, T, p0):
+    # θ = K p / (1 + K p), the utils.langmuir_isotherm form
+    K = params[:, 0:1]
+    denom = 1 + K * p
+    return K * p / denom, (p / denom**2)[..., None]
+
+
+def _bet(p, params, T, p0):
+    # q = qm C x / ((1 - x)(1 - x + C x)), x = p / p0
+    qm, C = params[:, 0:1], params[:, 1:2]
+    x = p / p0
+    inner = 1 - x + C * x
+    q = qm * C * x / ((1 - x) * inner)
+    jac = np.stack([q / qm, qm * x / inner**2], axis=-1)
+    return q, jac
+
+
+def _freundlich(p, params, T, p0):
+    # q = Kf p^(1/n)
+    Kf, n = params[:, 0:1], params[:, 1:2]
+    power = p ** (1 / n)
+    q = Kf * power
+    jac = np.stack([power, -q * np.log(p) / n**2], axis=-1)
+    return q, jac
+
+
+def _temkin(p, params, T, p0):
+    # q = (RT / bT) ln(KT p)
+    bT, KT = params[:, 0:1], params[:, 1:2]
+    A = R * T / bT
+    q = A * np.log(KT * p)
+    jac = np.stack([-q / bT, np.broadcast_to(A / KT, q.shape)], axis=-1)
+    return q, jac
+
+
+def _sips(p, params, T, p0):
+    # q = qmax u / (1 + u), u = (K p)^m (Langmuir-Freundlich)
+    qmax, K, m = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+    u = (K * p) ** m
+    frac = u / (1 + u)
+    dq_du = qmax / (1 + u) ** 2
+    jac = np.stack([frac, dq_du * m * u / K, dq_du * u * np.log(K * p)], axis=-1)
+    return qmax * frac, jac
+
+
+def _toth(p, params, T, p0):
+    # q = qmax K p / (1 + (K p)^t)^(1/t)
+    qmax, K, t = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+    x = K * p
+    xt = x**t
+    s = 1 + xt
+    q = qmax * x * s ** (-1 / t)
+    jac = np.stack([q / qmax, q / (K * s), q * (np.log(s) / t**2 - xt * np.log(x) / (t * s))], axis=-1)
+    return q, jac
+
+
+MODELS = {
+    "Langmuir": {"func": _langmuir, "params": ("qmax", "K")},
+    "Langmuir (θ)": {"func": _langmuir_theta, "params": ("K",)},
+    "BET": {"func": _bet, "params": ("qm", "C")},
+    "Freundlich": {"func": _freundlich, "params": ("Kf", "n")},
+    "Temkin": {"func": _temkin, "params": ("bT", "KT")},
+    "Sips": {"func": _sips, "params": ("qmax", "K", "m")},
+    "Toth": {"func": _toth, "params": ("qmax", "K", "t")},
+}
+
+
+def _linear_fit(x, y, mask):
+    """
+    Masked least-squares straight line y = slope * x + intercept for each row.
+    """
+    w = mask.astype(float)
+    count = np.maximum(w.sum(axis=1), 1)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    x_mean = (w * x).sum(axis=1) / count
+    y_mean = (w * y).sum(axis=1) / count
+    dx = np.where(mask, x - x_mean[:, None], 0.0)
+    dy = np.where(mask, y - y_mean[:, None], 0.0)
+    slope = (dx * dy).sum(axis=1) / np.maximum((dx * dx).sum(axis=1), 1e-300)
+    return slope, y_mean - slope * x_mean
+
+
+def _initial_guess(model, p, q, mask, T, p0):
+    """
+    Starting parameters from the linearized form of each model.
+    """
+    q_pos = mask & (q > 0)
+    q_scale = np.nanmax(np.where(mask, q, np.nan), axis=1)
+    p_scale = np.nanmedian(np.where(mask, p, np.nan), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if model in ("Langmuir", "Sips", "Toth"):
+            # p/q = 1/(K qmax) + p/qmax; Sips and Toth start from Langmuir (exponent 1)
+            slope, intercept = _linear_fit(p, p / q, q_pos)
+            guess = np.stack([1 / slope, slope / intercept], axis=1)
+            fallback = np.stack([1.2 * q_scale, 1 / p_scale], axis=1)
+            if model != "Langmuir":
+                guess = np.column_stack([guess, np.ones(len(guess))])
+                fallback = np.column_stack([fallback, np.ones(len(fallback))])
+        elif model == "Langmuir (θ)":
+            # θ / (1 - θ) = K p
+            ratio = np.where(mask & (q > 0) & (q < 1), q / (1 - q) / p, np.nan)
+            guess = np.nanmedian(ratio, axis=1)[:, None]
+            fallback = (1 / p_scale)[:, None]
+        elif model == "BET":
+            # x / (q (1 - x)) = 1/(qm C) + (C - 1)/(qm C) x
+            x = p / p0
+            slope, intercept = _linear_fit(x, x / (q * (1 - x)), q_pos)
+            guess = np.stack([1 / (slope + intercept), slope / intercept + 1], axis=1)
+            fallback = np.stack([0.5 * q_scale, np.full_like(q_scale, 10.0)], axis=1)
+        elif model == "Freundlich":
+            # log q = (1/n) log p + log Kf
+            slope, intercept = _linear_fit(np.log(p), np.log(q), q_pos & (p > 0))
+            guess = np.stack([np.exp(intercept), 1 / slope], axis=1)
+            fallback = np.stack([q_scale / np.sqrt(np.nanmax(np.where(mask, p, np.nan), axis=1)),
+                                 np.full_like(q_scale, 2.0)], axis=1)
+        else:
+            # q = A ln KT + A ln p, A = RT / bT
+            slope, intercept = _linear_fit(np.log(p), q, mask)
+            guess = np.stack([R * T[:, 0] / slope, np.exp(intercept / slope)], axis=1)
+            fallback = np.stack([R * T[:, 0] / np.maximum(q_scale, 1e-12), 10 / p_scale], axis=1)
+    bad = ~(np.isfinite(guess) & (guess > 0))
+    guess[bad] = fallback[bad]
+    guess[~(np.isfinite(guess) & (guess > 0))] = 1.0
+    return guess
+
+
+def as_batch(values, width=None):
+    """
+    Pad a 2-D array or a list of 1-D arrays into a float (datasets, points) array.
+    """
+    if isinstance(values, np.ndarray) and values.ndim == 2:
+        return values.astype(float)
+    rows = [np.asarray(row, dtype=float).ravel() for row in values]
+    width = width or max((len(row) for row in rows), default=0)
+    batch = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        batch[i, :len(row)] = row
+    return batch
+
+
+def valid_mask(model, p, q, p0):
+    """
+    Points of a padded batch that a model can be fitted to.
+    """
+    mask = np.isfinite(p) & np.isfinite(q)
+    if model in ("Freundlich", "Temkin", "Sips", "Toth"):
+        mask &= p > 0
+    if model == "BET":
+        mask &= (p > 0) & (p < p0)
+    return mask
+
+
+def _fit_arrays(model, p, q, T, p0, max_iter, tol):
+    """
+    Levenberg-Marquardt on a padded batch of datasets.
+    """
+    func = MODELS[model]["func"]
+    mask = valid_mask(model, p, q, p0)
+    p = np.where(mask, p, 1.0)
+    q = np.where(mask, q, 0.0)
+    n_data = len(p)
+
+    def evaluate(log_params):
+        params = np.exp(log_params)
+        with np.errstate(all="ignore"):
+            q_hat, jac = func(p, params, T, p0)
+        resid = np.where(mask, q_hat - q, 0.0)
+        # Chain rule to log-parameters: dq/d(ln θ) = θ dq/dθ
+        jac = np.where(mask[..., None], jac * params[:, None, :], 0.0)
+        cost = np.einsum("ij,ij->i", resid, resid)
+        cost = np.where(np.isfinite(cost), cost, np.inf)
+        return resid, jac, cost
+
+    log_params = np.log(_initial_guess(model, p, q, mask, T, p0))
+    resid, jac, cost = evaluate(log_params)
+    lam = np.full(n_data, 1e-3)
+    active = np.isfinite(cost) & (mask.sum(axis=1) > 0)
+    converged = np.zeros(n_data, dtype=bool)
+    iterations = np.zeros(n_data, dtype=int)
+    k = log_params.shape[1]
+    eye = np.eye(k)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        JtJ = np.einsum("ijk,ijl->ikl", jac, jac)
+        Jtr = np.einsum("ijk,ij->ik", jac, resid)
+        diag = np.maximum(np.einsum("ikk->ik", JtJ), 1e-12)
+        damped = JtJ + lam[:, None, None] * diag[:, :, None] * eye
+        damped = np.where(np.isfinite(damped), damped, 0.0) + 1e-300 * eye
+        step = -np.linalg.solve(damped, np.where(np.isfinite(Jtr), Jtr, 0.0)[..., None])[..., 0]
+        step = np.clip(step, -5.0, 5.0)
+
+        trial = np.where(active[:, None], log_params + step, log_params)
+        trial_resid, trial_jac, trial_cost = evaluate(trial)
+        accept = active & (trial_cost < cost)
+
+        improvement = np.where(accept, cost - trial_cost, 0.0)
+        log_params = np.where(accept[:, None], trial, log_params)
+        resid = np.where(accept[:, None], trial_resid, resid)
+        jac = np.where(accept[:, None, None], trial_jac, jac)
+        cost = np.where(accept, trial_cost, cost)
+        lam = np.where(accept, lam * 0.3, lam * 10.0)
+        iterations += active
+
+        done = active & ((accept & (improvement <= tol * (cost + tol)))
+                         | (np.abs(step).max(axis=1) < 1e-10)
+                         | (lam > 1e12))
+        converged |= done & (lam <= 1e12)
+        active &= ~done
+
+    return {
+        "model": model,
+        "param_names": MODELS[model]["params"],
+        "params": np.exp(log_params),
+        "rss": cost,
+        "n_points": mask.sum(axis=1),
+        "converged": converged,
+        "iterations": iterations,
+    }
+
+
+def _fit_chunk(args):
+    return _fit_arrays(*args)
+
+
+def fit_batch(model: str, pressures, uptakes, *, T=298.0, p0=None, max_iter: int = 200,
+              tol: float = 1e-12, workers: int | None = None, chunk_size: int = 5000) -> dict:
+    """
+    Fit one isotherm model to many independent datasets.
+
+    `pressures` and `uptakes` are (datasets, points) arrays padded with NaN or
+    lists of 1-D arrays of differing lengths. `T` (Temkin) and `p0` (BET,
+    defaults to 1.05 x the largest pressure of each dataset) may be scalars or
+    per-dataset arrays. With `workers` > 1 the batch is split into chunks that
+    are fitted in a process pool.
+
+    Returns a dict with the fitted `params` (datasets, n_params), their
+    `param_names`, residual sum of squares `rss`, `n_points`, `converged`
+    and `iterations`.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown isotherm model: {model!r}")
+    p = as_batch(pressures)
+    q = as_batch(uptakes, width=p.shape[1])
+    if p.shape != q.shape:
+        raise ValueError(f"pressures {p.shape} and uptakes {q.shape} differ in shape")
+    T = np.broadcast_to(np.asarray(T, dtype=float), (len(p),))[:, None]
+    if p0 is None:
+        p0 = 1.05 * np.nanmax(np.where(np.isfinite(p), p, -np.inf), axis=1)
+    p0 = np.broadcast_to(np.asarray(p0, dtype=float), (len(p),))[:, None]
+
+    if not workers or workers <= 1 or len(p) <= chunk_size:
+        return _fit_arrays(model, p, q, T, p0, max_iter, tol)
+
+    bounds = range(0, len(p), chunk_size)
+    tasks = [(model, p[i:i + chunk_size], q[i:i + chunk_size], T[i:i + chunk_size],
+              p0[i:i + chunk_size], max_iter, tol) for i in bounds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_fit_chunk, tasks))
+    result = {"model": model, "param_names": MODELS[model]["params"]}
+    for key in ("params", "rss", "n_points", "converged", "iterations"):
+        result[key] = np.concatenate([part[key] for part in parts])
+    return result
+
+
+def fit_isotherm(model: str, pressures, uptakes, *, T: float = 298.0, p0: float | None = None) -> dict:
+    """
+    Fit one isotherm model to a single dataset.
+
+    Returns the fitted parameters by name together with `rss`, `n_points`
+    and `converged`.
+    """
+    result = fit_batch(model, [pressures], [uptakes], T=T, p0=p0)
+    fitted = dict(zip(result["param_names"], result["params"][0]))
+    fitted.update(rss=result["rss"][0], n_points=int(result["n_points"][0]),
+                  converged=bool(result["converged"][0]))
+    return fitted
+
+
+def predict(model: str, pressures, params, *, T=298.0, p0=None) -> np.ndarray:
+    """
+    Evaluate a fitted model; `params` is (n_params,) or (datasets, n_params).
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    p = np.atleast_2d(np.asarray(pressures, dtype=float))
+    T = np.asarray(T, dtype=float).reshape(-1, 1)
+    p0 = np.asarray(p.max() * 1.05 if p0 is None else p0, dtype=float).reshape(-1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q, _ = MODELS[model]["func"](p, params, T, p0)
+    return q if q.shape[0] > 1 else q[0]
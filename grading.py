@@ -0,0 +1,171 @@
+"""
+Bulk grading of quiz response logs with classical item statistics.
+
+A response log is a JSONL file with one quiz submission per line, as written
+by the Quiz page when QUIZ_LOG_PATH is set:
+
+    {"student": "s-001", "answers": [{"question": "...", "choice": "..."}, ...]}
+
+"choice" is the chosen answer text (or its index in the bank's choice list).
+Submissions are graded in chunks with NumPy and every item's statistics are
+accumulated as running sums, so memory stays bounded by the chunk size and
+the bank size however many students the logs contain:
+
+    python grading.py logs/*.jsonl --scores scores.csv --items items.csv
+
+Item difficulty is the proportion of correct responses; discrimination is
+the correlation between answering the item correctly and the rest of the
+submission's score (corrected item-total correlation).
+"""
+import argparse
+import csv
+import json
+
+import numpy as np
+import pandas as pd
+
+from question_bank import QuestionBank
+
+STAT_FIELDS = ("n", "x", "r", "r2", "xr")
+
+
+def iter_submissions(paths):
+    """
+    Yield submissions from JSONL log files, skipping blank lines.
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _encode(submissions: list[dict], bank: QuestionBank):
+    """
+    Flatten a chunk of submissions into (submission, item, chosen index) arrays.
+
+    Answers to questions that are not in the bank are dropped and counted.
+    """
+    rows, items, chosen = [], [], []
+    unknown = 0
+    for row, submission in enumerate(submissions):
+        for answer in submission["answers"]:
+            item_id = bank.ids.get(answer["question"])
+            if item_id is None:
+                unknown += 1
+                continue
+            choice = answer["choice"]
+            if not isinstance(choice, int):
+                choices = bank[item_id]["choices"]
+                choice = choices.index(choice) if choice in choices else -1
+            rows.append(row)
+            items.append(item_id)
+            chosen.append(choice)
+    return np.array(rows, dtype=np.int64), np.array(items, dtype=np.int64), np.array(chosen, dtype=np.int64), unknown
+
+
+def grade_logs(paths, bank: QuestionBank, *, scores_path=None, chunk_size: int = 50_000) -> dict:
+    """
+    Grade every submission in `paths` and accumulate per-item statistics.
+
+    Per-student scores are streamed to `scores_path` (CSV) when given.
+    Returns the item statistics as a DataFrame ("items"), the number of
+    graded submissions and responses, the score mean and standard deviation,
+    and the number of answers to unknown questions.
+    """
+    correct_index = np.array([item["correct"] for item in bank.items], dtype=np.int64)
+    stats = {field: np.zeros(len(bank)) for field in STAT_FIELDS}
+    totals = {"submissions": 0, "responses": 0, "unknown": 0, "score_sum": 0.0, "score_sq": 0.0}
+
+    scores_file = open(scores_path, "w", newline="", encoding="utf-8") if scores_path else None
+    try:
+        writer = csv.writer(scores_file) if scores_file else None
+        if writer:
+            writer.writerow(["student", "answered", "correct", "score_pct"])
+
+        def flush(chunk):
+            rows, items, chosen, unknown = _encode(chunk, bank)
+            correct = (chosen == correct_index[items]).astype(float)
+            answered = np.bincount(rows, minlength=len(chunk))
+            score = np.bincount(rows, weights=correct, minlength=len(chunk))
+            rest = score[rows] - correct
+            for field, weights in (("n", None), ("x", correct), ("r", rest), ("r2", rest**2),
+                                   ("xr", correct * rest)):
+                stats[field] += np.bincount(items, weights=weights, minlength=len(bank))
+
+            totals["submissions"] += len(chunk)
+            totals["responses"] += len(items)
+            totals["unknown"] += unknown
+            totals["score_sum"] += score.sum()
+            totals["score_sq"] += (score**2).sum()
+            if writer:
+                with np.errstate(invalid="ignore"):
+                    pct = 100 * score / answered
+                writer.writerows(zip((s.get("student", "") for s in chunk), answered.tolist(),
+                                     score.astype(int).tolist(), np.round(pct, 1).tolist()))
+
+        chunk = []
+        for submission in iter_submissions(paths):
+            chunk.append(submission)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    finally:
+        if scores_file:
+            scores_file.close()
+
+    n = totals["submissions"]
+    mean = totals["score_sum"] / n if n else np.nan
+    return {
+        "items": item_statistics(stats, bank),
+        "submissions": n,
+        "responses": totals["responses"],
+        "unknown_answers": totals["unknown"],
+        "score_mean": mean,
+        "score_std": np.sqrt(max(totals["score_sq"] / n - mean**2, 0.0)) if n else np.nan,
+    }
+
+
+def item_statistics(stats: dict, bank: QuestionBank) -> pd.DataFrame:
+    """
+    Difficulty and discrimination of every answered item from the running sums.
+    """
+    n, x, r, r2, xr = (stats[field] for field in STAT_FIELDS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difficulty = x / n
+        cov = n * xr - x * r
+        discrimination = cov / np.sqrt((n * x - x**2) * (n * r2 - r**2))
+    answered = n > 0
+    return pd.DataFrame({
+        "question": [item["question"] for item in bank.items],
+        "topic": [item["topic"] for item in bank.items],
+        "level": [item["difficulty"] for item in bank.items],
+        "responses": n.astype(np.int64),
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+    })[answered].reset_index(drop=True)
+
+
+def main(argv=None):
+    from quiz import question_bank
+
+    parser = argparse.ArgumentParser(description="Grade quiz response logs and compute item statistics.")
+    parser.add_argument("logs", nargs="+", help="JSONL response logs")
+    parser.add_argument("--scores", help="Per-student scores output (.csv)")
+    parser.add_argument("--items", default="item_statistics.csv", help="Item statistics output (.csv)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Submissions graded per chunk")
+    args = parser.parse_args(argv)
+
+    result = grade_logs(args.logs, question_bank(), scores_path=args.scores, chunk_size=args.chunk_size)
+    result["items"].to_csv(args.items, index=False)
+    print(f"Graded {result['submissions']} submissions ({result['responses']} responses), "
+          f"mean score {result['score_mean']:.2f} ± {result['score_std']:.2f}")
+    if result["unknown_answers"]:
+        print(f"Skipped {result['unknown_answers']} answers to questions not in the bank")
+    print(f"Wrote item statistics to {args.items}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import numpy as np
+from isotherms import isotherm
+from tracing import traced
+
+# BET diverges at p = p0; the grid stops just short of it.
+BET_CUTOFF = 0.99
+
+
+def adaptive_grid(func, p_min: float, p_max: float, *, tol: float = 1e-3, initial_points: int = 9,
+                  max_points: int = 1000) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sample a 1-D function on a grid refined where it is curved.
+
+    Starting from a coarse uniform grid, every interval whose midpoint deviates
+    from linear interpolation by more than `tol` times the sampled range of the
+    function is bisected, until all intervals pass or `max_points` is reached.
+    Midpoints are evaluated in one vectorized call per refinement pass and
+    intervals that already pass are never revisited.
+
+    Returns the grid and the function values on it.
+    """
+    x = np.linspace(p_min, p_max, initial_points)
+    y = np.asarray(func(x), dtype=float)
+    pending = np.ones(len(x) - 1, dtype=bool)
+    min_width = (p_max - p_min) * 1e-9
+
+    while pending.any() and len(x) < max_points:
+        idx = np.flatnonzero(pending)
+        x_mid = 0.5 * (x[idx] + x[idx + 1])
+        y_mid = np.asarray(func(x_mid), dtype=float)
+
+        finite = np.concatenate([y[np.isfinite(y)], y_mid[np.isfinite(y_mid)]])
+        scale = np.ptp(finite) if finite.size else 0.0
+        scale = scale if scale > 0 else 1.0
+        with np.errstate(invalid="ignore"):
+            err = np.abs(y_mid - 0.5 * (y[idx] + y[idx + 1]))
+            refine = (err > tol * scale) & (x[idx + 1] - x[idx] > min_width)
+
+        budget = max_points - len(x)
+        if refine.sum() > budget:
+            keep = np.argsort(np.where(refine, -err, np.inf))[:budget]
+            refine = np.zeros_like(refine)
+            refine[keep] = True
+
+        pending[idx[~refine]] = False
+        split = idx[refine]
+        x = np.insert(x, split + 1, x_mid[refine])
+        y = np.insert(y, split + 1, y_mid[refine])
+        pending = np.insert(pending, split + 1, True)
+
+    return x, y
+
+
+@traced()
+def pressure_grid(model: str, P_max: float, *, tol: float = 1e-3, max_points: int = 1000,
+                  **params) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Adaptive pressure grid and isotherm values for one model on [0, P_max].
+
+    `params` are passed to `isotherms.isotherm`. For BET the grid ends at
+    BET_CUTOFF * p0 instead of at the singularity.
+    """
+    p_end = P_max
+    if model == "BET":
+        params.setdefault("p0", P_max)
+        p_end = BET_CUTOFF * params["p0"]
+    return adaptive_grid(lambda p: isotherm(model, p, **params), 0.0, p_end,
+                         tol=tol, max_points=max_points)
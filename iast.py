@@ -0,0 +1,167 @@
+"""
+Ideal Adsorbed Solution Theory (IAST) for multicomponent adsorption.
+
+Pure components are described with the isotherm forms of `fitting.MODELS`
+(same parameter names). For each of them the reduced spreading pressure
+
+    ψ(p) = ∫₀ᵖ q(p') / p' dp'
+
+and its inverse have closed forms, so IAST reduces to one scalar equation per
+gas composition, Σ yᵢ P / pᵢ°(ψ) = 1, which is solved with a safeguarded
+Newton iteration (with bisection inside a per-point bracket as a
+fallback) vectorized over any number of compositions and pressures.
+Temkin is not supported because its spreading pressure diverges at p → 0.
+"""
+import numpy as np
+
+from fitting import MODELS
+
+
+def _langmuir(spec):
+    qmax, K = spec["qmax"], spec["K"]
+    return {
+        "psi": lambda p: qmax * np.log1p(K * p),
+        "pressure": lambda psi: np.expm1(psi / qmax) / K,
+        "dpressure": lambda psi: np.exp(psi / qmax) / (qmax * K),
+    }
+
+
+def _freundlich(spec):
+    Kf, n = spec["Kf"], spec["n"]
+    return {
+        "psi": lambda p: n * Kf * p ** (1 / n),
+        "pressure": lambda psi: (psi / (n * Kf)) ** n,
+        "dpressure": lambda psi: (psi / (n * Kf)) ** (n - 1) / Kf,
+    }
+
+
+def _bet(spec):
+    qm, C, p0 = spec["qm"], spec["C"], spec["p0"]
+
+    def pressure(psi):
+        E = np.exp(psi / qm)
+        return p0 * (E - 1) / (E + C - 1)
+
+    def dpressure(psi):
+        E = np.exp(psi / qm)
+        return p0 * E * C / (qm * (E + C - 1) ** 2)
+
+    return {
+        "psi": lambda p: qm * np.log((1 + (C - 1) * p / p0) / (1 - p / p0)),
+        "pressure": pressure,
+        "dpressure": dpressure,
+    }
+
+
+# Closed-form spreading pressure ψ(p), its inverse p°(ψ) and dp°/dψ per model
+SPREADING_PRESSURE = {"Langmuir": _langmuir, "Freundlich": _freundlich, "BET": _bet}
+
+
+def _component(spec):
+    """
+    Spreading-pressure functions of one pure component plus its `fitting.MODELS` loading.
+    """
+    model = spec["model"]
+    if model not in SPREADING_PRESSURE:
+        raise ValueError(f"IAST does not support the {model!r} isotherm")
+    missing = [name for name in MODELS[model]["params"] if name not in spec]
+    if missing:
+        raise ValueError(f"{model} component needs {', '.join(missing)}")
+    func = MODELS[model]["func"]
+    params = np.array([[float(spec[name]) for name in MODELS[model]["params"]]])
+    p0 = np.array([[float(spec.get("p0", np.nan))]])
+
+    def loading(p):
+        p = np.asarray(p, dtype=float)
+        q, _ = func(p.reshape(1, -1), params, 298.0, p0)
+        return q.reshape(p.shape)
+
+    return {**SPREADING_PRESSURE[model](spec), "loading": loading}
+
+
+def iast(components: list[dict], y, P, *, tol: float = 1e-10, max_iter: int = 100) -> dict:
+    """
+    Solve IAST for gas mole fractions `y` (..., n_components) at total pressure `P` (bar).
+
+    `components` are dicts with a "model" key ("Langmuir", "Freundlich" or
+    "BET") and that model's `fitting.MODELS` parameters (plus "p0" for BET),
+    e.g. {"model": "Langmuir", "qmax": 5, "K": 2}. `y` and `P` broadcast
+    against each other, so a whole composition x pressure grid is solved at
+    once. Returns adsorbed-phase mole fractions "x", component loadings "q"
+    (both (..., n_components)), the total loading "q_total", the reduced
+    spreading pressure "psi" and a "converged" mask; points that did not
+    converge are NaN.
+    """
+    pure = [_component(spec) for spec in components]
+    y = np.asarray(y, dtype=float)
+    P = np.asarray(P, dtype=float)
+    if y.shape[-1] != len(pure):
+        raise ValueError(f"y has {y.shape[-1]} components, expected {len(pure)}")
+    shape = np.broadcast_shapes(y.shape[:-1], P.shape)
+    y = np.broadcast_to(y, shape + (len(pure),))
+    partial = y * np.broadcast_to(P, shape)[..., None]
+
+    # Newton on h(u) = ln Σ yᵢP/pᵢ°(ψ) with u = ln ψ. h falls monotonically in u,
+    # so every evaluation narrows a bracket [lo, hi] around the root; steps
+    # that would leave the bracket are replaced by bisection.
+    psi0 = sum(y[..., i] * comp["psi"](partial.sum(axis=-1)) for i, comp in enumerate(pure))
+    u = np.log(np.maximum(psi0, 1e-300))
+    lo = np.full(shape, -np.inf)
+    hi = np.full(shape, np.inf)
+    active = np.ones(shape, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iter):
+            psi = np.exp(u)
+            p_pure = np.stack([comp["pressure"](psi) for comp in pure], axis=-1)
+            dp_pure = np.stack([comp["dpressure"](psi) for comp in pure], axis=-1)
+            total = (partial / p_pure).sum(axis=-1)
+            h = np.log(total)
+            active &= ~(np.abs(h) <= tol)
+            if not active.any():
+                break
+            lo = np.where(active & (h > 0), u, lo)
+            hi = np.where(active & (h < 0), u, hi)
+            dh = -(partial * dp_pure / p_pure**2).sum(axis=-1) * psi / total
+            newton = u + np.clip(-h / dh, -2.0, 2.0)
+            bracketed = np.isfinite(lo) & np.isfinite(hi)
+            inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+            # Without a finite bracket yet, expand towards the root instead.
+            fallback = np.where(bracketed, 0.5 * (lo + hi), u + np.where(h > 0, 2.0, -2.0))
+            u = np.where(active, np.where(inside, newton, fallback), u)
+
+        psi = np.exp(u)
+        p_pure = np.stack([comp["pressure"](psi) for comp in pure], axis=-1)
+        x = partial / p_pure
+        x = x / x.sum(axis=-1, keepdims=True)
+        q_pure = np.stack([comp["loading"](p_pure[..., i]) for i, comp in enumerate(pure)], axis=-1)
+        q_total = 1 / (x / q_pure).sum(axis=-1)
+    converged = ~active
+    x = np.where(converged[..., None], x, np.nan)
+    q_total = np.where(converged, q_total, np.nan)
+    return {"x": x, "q": x * q_total[..., None], "q_total": q_total, "psi": np.where(converged, psi, np.nan),
+            "converged": converged}
+
+
+def selectivity(result: dict, y, i: int = 0, j: int = 1) -> np.ndarray:
+    """
+    Adsorption selectivity S_ij = (x_i / y_i) / (x_j / y_j) from an IAST result.
+    """
+    y = np.asarray(y, dtype=float)
+    x = result["x"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (x[..., i] / y[..., i]) / (x[..., j] / y[..., j])
+
+
+def binary_selectivity_map(components: list[dict], y1, P) -> dict:
+    """
+    IAST selectivity of component 0 over component 1 on a y₁ x P grid.
+
+    Returns arrays of shape (len(P), len(y1)) for the selectivity and the
+    loadings of both components.
+    """
+    y1 = np.asarray(y1, dtype=float)
+    y = np.stack([y1, 1 - y1], axis=-1)[None, :, :]
+    P = np.asarray(P, dtype=float)[:, None]
+    result = iast(components, y, P)
+    return {"selectivity": selectivity(result, y), "q1": result["q"][..., 0],
+            "q2": result["q"][..., 1], "converged": result["converged"]}
@@ -0,0 +1,84 @@
+import numpy as np
+
+from thermo import R
+
+MODELS = ("Langmuir", "Freundlich", "BET", "Temkin")
+
+
+def _prepare_out(shape: tuple, out: np.ndarray | None) -> np.ndarray:
+    """
+    Return a float output buffer of the given broadcast shape.
+    """
+    if out is None:
+        return np.empty(shape, dtype=float)
+    if out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+    return out
+
+
+def isotherm(model: str, pressures, K, qmax=1.0, *, n=2.0, C=10.0, b=100.0, T=298.0,
+             p0=None, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Evaluate an adsorption isotherm over broadcast arrays of its arguments.
+
+    Every argument may be a scalar or an array; the result has the broadcast
+    shape of all of them, so a pressure axis, a temperature axis and a
+    parameter-set axis can be evaluated in a single call. `p0` is the
+    saturation pressure used by the BET model (defaults to max(pressures)).
+    When `out` is given the result is written into it without allocating.
+    """
+    p = np.asarray(pressures, dtype=float)
+    K = np.asarray(K, dtype=float)
+    qmax = np.asarray(qmax, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if model == "Langmuir":
+            # q = qmax * (K * p) / (1 + K * p)
+            out = _prepare_out(np.broadcast_shapes(p.shape, K.shape, qmax.shape), out)
+            np.multiply(K, p, out=out)
+            np.divide(out, 1 + out, out=out)
+        elif model == "Freundlich":
+            # q = qmax * (K * p^(1/n)) / (1 + K * p^(1/n))
+            n = np.asarray(n, dtype=float)
+            out = _prepare_out(np.broadcast_shapes(p.shape, K.shape, qmax.shape, n.shape), out)
+            np.power(p, 1 / n, out=out)
+            np.multiply(out, K, out=out)
+            np.divide(out, 1 + out, out=out)
+        elif model == "BET":
+            # Simplified BET model
+            C = np.asarray(C, dtype=float)
+            p0 = np.asarray(p.max() if p0 is None else p0, dtype=float)
+            out = _prepare_out(np.broadcast_shapes(p.shape, K.shape, qmax.shape, C.shape, p0.shape), out)
+            x = p / p0
+            np.multiply(C, p, out=out)
+            np.divide(out, (1 - x) * (1 + (C - 1) * x), out=out)
+        elif model == "Temkin":
+            # q = qmax * x / (1 + x) with x = (RT/b) ln(K p), zero for p <= 0
+            b = np.asarray(b, dtype=float)
+            T = np.asarray(T, dtype=float)
+            out = _prepare_out(np.broadcast_shapes(p.shape, K.shape, qmax.shape, b.shape, T.shape), out)
+            np.multiply(K, p, out=out)
+            np.log(out, out=out)
+            np.multiply(out, R * T / b, out=out)
+            np.divide(out, 1 + out, out=out)
+            np.copyto(out, 0.0, where=np.broadcast_to(p <= 0, out.shape))
+        else:
+            raise ValueError(f"Unknown isotherm model: {model!r}")
+
+        np.multiply(out, qmax, out=out)
+    return out
+
+
+def material_isotherms(model: str, pressures, scales, *, out: np.ndarray | None = None,
+                       **params) -> np.ndarray:
+    """
+    Evaluate one isotherm for several materials at once.
+
+    The base curve is computed once and scaled by each material's factor,
+    returning an array of shape (len(scales), len(pressures)).
+    """
+    scales = np.asarray(scales, dtype=float)
+    base = isotherm(model, pressures, **params)
+    out = _prepare_out(scales.shape + base.shape, out)
+    np.multiply.outer(scales, base, out=out)
+    return out
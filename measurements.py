@@ -0,0 +1,66 @@
+"""
+Measured isotherm data: Arrow-backed parsing and plot downsampling.
+
+Instrument exports with 10⁵-10⁶ points are parsed column-wise by pyarrow
+(multithreaded CSV reader or Parquet), converted to NumPy without row loops,
+and thinned with Largest-Triangle-Three-Buckets (LTTB) before plotting so
+the browser only receives a few thousand points that keep the visual shape.
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# Largest trace sent to the browser for measured data.
+PLOT_MAX_POINTS = 2000
+
+
+def read_measurements(source, name: str) -> dict[str, np.ndarray]:
+    """
+    Numeric columns of a CSV or Parquet export as float64 arrays.
+
+    `source` is a path or binary file object; `name` (the file name) selects
+    the format. Non-numeric columns are skipped, nulls become NaN.
+    """
+    table = pq.read_table(source) if name.lower().endswith(".parquet") else pv.read_csv(source)
+    columns = {}
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            values = pc.cast(column, pa.float64()).combine_chunks()
+            columns[field.name] = values.fill_null(np.nan).to_numpy(zero_copy_only=False)
+    return columns
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int = PLOT_MAX_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a trace to `n_out` points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; from every bucket in between the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket is chosen. Rows with NaN are dropped first.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # n_out - 2 interior buckets spanning indices [1, n - 1), plus the last point.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(np.append(edges, n))
+    mean_x = np.add.reduceat(x, edges) / counts
+    mean_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return x[selected], y[selected]
@@ -0,0 +1,175 @@
+"""
+Prometheus instrumentation of the app.
+
+Metrics are collected per process and served on a local endpoint
+(http://127.0.0.1:9464/metrics by default; set METRICS_PORT to change the
+port or to 0 to disable it):
+
+- physchem_page_rerun_seconds{page}: duration of a full page rerun
+- physchem_fragment_run_seconds{fragment}: duration of a page section that
+  reruns on its own (an st.fragment), both inside a full rerun and by
+  itself; fragment-only reruns do not show up in the page histogram
+- physchem_compute_seconds{stage}: isotherm evaluation, 3D surface
+  generation, figure and export serialization and the case-study simulators
+- physchem_cache_*: hits, misses, hit ratio and size of the simulation cache
+- physchem_active_sessions: sessions that reran within the last
+  ACTIVE_SESSION_WINDOW seconds
+
+Streamlit re-imports the module when its source changes. The collectors
+live on a dedicated registry created once per process with
+st.cache_resource, so a re-import reuses them instead of registering the
+same metric names twice.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from prometheus_client import CollectorRegistry, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from simcache import cache_info
+from tracing import fragment_trace, span
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+METRICS_ADDR = "127.0.0.1"
+ACTIVE_SESSION_WINDOW = 300.0  # seconds
+
+RERUN_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+@st.cache_resource
+def _collectors() -> dict:
+    """
+    The process-wide registry and its histograms, created on first import only.
+    """
+    registry = CollectorRegistry()
+    return {
+        "registry": registry,
+        "app": None,
+        "page": Histogram("physchem_page_rerun_seconds", "Duration of a page rerun", ["page"],
+                          buckets=RERUN_BUCKETS, registry=registry),
+        "fragment": Histogram("physchem_fragment_run_seconds", "Duration of a page fragment run",
+                              ["fragment"], buckets=RERUN_BUCKETS, registry=registry),
+        "compute": Histogram("physchem_compute_seconds", "Time spent in a compute or serialization stage",
+                             ["stage"], registry=registry),
+    }
+
+
+_COLLECTORS = _collectors()
+PAGE_RERUN_SECONDS = _COLLECTORS["page"]
+FRAGMENT_RUN_SECONDS = _COLLECTORS["fragment"]
+COMPUTE_SECONDS = _COLLECTORS["compute"]
+
+_sessions = {}  # session id -> last rerun (monotonic seconds)
+_lock = threading.Lock()
+_server_started = False
+
+
+class AppCollector:
+    """
+    Cache and session metrics, read at scrape time.
+    """
+
+    def collect(self):
+        info = cache_info()
+        lookups = info["hits"] + info["misses"]
+        yield CounterMetricFamily("physchem_cache_hits", "Simulation cache hits", value=info["hits"])
+        yield CounterMetricFamily("physchem_cache_misses", "Simulation cache misses", value=info["misses"])
+        yield GaugeMetricFamily("physchem_cache_hit_ratio", "Simulation cache hit ratio",
+                                value=info["hits"] / lookups if lookups else 0.0)
+        yield GaugeMetricFamily("physchem_cache_bytes", "Simulation cache size in bytes", value=info["bytes"])
+        yield GaugeMetricFamily("physchem_cache_entries", "Simulation cache entries", value=info["entries"])
+        yield GaugeMetricFamily("physchem_active_sessions", "Sessions active within the last "
+                                f"{ACTIVE_SESSION_WINDOW:.0f} s", value=active_sessions())
+
+
+def start_metrics_server():
+    """
+    Serve /metrics on METRICS_ADDR:METRICS_PORT, once per process.
+
+    A port that is already taken (e.g. by another app process) is ignored.
+    """
+    global _server_started
+    with _lock:
+        if _server_started or not METRICS_PORT:
+            return
+        _server_started = True
+    try:
+        start_http_server(METRICS_PORT, addr=METRICS_ADDR, registry=_COLLECTORS["registry"])
+    except OSError:
+        pass
+
+
+def track_session(session_id: str):
+    """
+    Record a rerun of the given session.
+    """
+    now = time.monotonic()
+    with _lock:
+        _sessions[session_id] = now
+
+
+def active_sessions() -> int:
+    """
+    Number of sessions that reran within ACTIVE_SESSION_WINDOW; older ones are dropped.
+    """
+    cutoff = time.monotonic() - ACTIVE_SESSION_WINDOW
+    with _lock:
+        for session_id in [sid for sid, seen in _sessions.items() if seen < cutoff]:
+            del _sessions[session_id]
+        return len(_sessions)
+
+
+@contextmanager
+def page_timer(page: str):
+    """
+    Time a page rerun under its PAGES label.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PAGE_RERUN_SECONDS.labels(page).observe(time.perf_counter() - start)
+
+
+def fragment_timer(fragment: str):
+    """
+    Decorator timing every run of a fragment function, including fragment-only reruns.
+
+    Each run is also traced with `tracing.fragment_trace`.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with fragment_trace(fragment):
+                    return func(*args, **kwargs)
+            finally:
+                FRAGMENT_RUN_SECONDS.labels(fragment).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Time a compute or serialization stage; also a span of the current trace.
+    """
+    start = time.perf_counter()
+    try:
+        with span(stage, "stage"):
+            yield
+    finally:
+        COMPUTE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+# Replace the collector of an earlier import so that its code changes take effect.
+with _lock:
+    if _COLLECTORS["app"] is not None:
+        _COLLECTORS["registry"].unregister(_COLLECTORS["app"])
+    _COLLECTORS["app"] = AppCollector()
+    _COLLECTORS["registry"].register(_COLLECTORS["app"])
@@ -1,4 +1,12 @@
 import streamlit as st
+import numpy as np
+from page_registry import lazy_module
+
+# Only needed for recommendations from measured data; imported on first use.
+pd = lazy_module("pandas")
+go = lazy_module("plotly.graph_objects")
+fitting = lazy_module("fitting")
+model_selection = lazy_module("model_selection")
 
 def recommend_model(adsorbent_nature, adsorption_type, interactions):
     # Simplified recommendation logic considering only Langmuir, BET, Temkin, and Freundlich isotherms.
@@ -19,8 +27,68 @@ def recommend_model(adsorbent_nature, adsorption_type, interactions):
     # Fallback: If system conditions are broad, suggest Langmuir as a default.
     return "Langmuir Isotherm", "Recommended as a default model for various adsorption systems."
 
+def data_recommendation():
+    st.markdown("""
+    **Instructions:**  
+    Upload measured adsorption data (CSV or Parquet) with a pressure and an uptake column.  
+    Every candidate model is fitted and ranked by an information criterion; the runs test flags fits whose residuals follow a systematic trend.
+    """)
+    uploaded = st.file_uploader("Measured Isotherm", type=["csv", "parquet"])
+    if uploaded is None:
+        return
+    data = pd.read_parquet(uploaded) if uploaded.name.endswith(".parquet") else pd.read_csv(uploaded)
+    numeric = list(data.select_dtypes("number").columns)
+    if len(numeric) < 2:
+        st.error("The file needs at least two numeric columns (pressure and uptake).")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        p_col = st.selectbox("Pressure Column", numeric, index=0)
+        q_col = st.selectbox("Uptake Column", numeric, index=1)
+        criterion = st.selectbox("Ranking Criterion", model_selection.CRITERIA)
+    with col2:
+        T = st.number_input("Temperature (K)", min_value=1.0, max_value=2000.0, value=298.0, step=1.0,
+                            help="Used by the Temkin model.")
+        p0 = st.number_input("Saturation Pressure p₀ (BET)", min_value=0.0, value=0.0,
+                             help="0 uses 1.05 × the largest measured pressure.")
+        candidates = model_selection.CANDIDATE_MODELS
+        models = st.multiselect("Candidate Models", candidates, default=list(candidates))
+    if not models:
+        return
+
+    p, q = data[p_col].to_numpy(float), data[q_col].to_numpy(float)
+    p0 = p0 or 1.05 * np.nanmax(p)
+    ranking = model_selection.rank_batch([p], [q], T=T, p0=p0, models=models, criterion=criterion)
+    if not np.isfinite(ranking["weight"]).any():
+        st.error("None of the candidate models could be fitted; check that the columns hold positive, "
+                 "finite pressures and uptakes.")
+        return
+    best = ranking.iloc[0]
+    st.success(f"**Best-supported Model:** {best['model']} (weight {best['weight']:.2f})")
+    if best["runs_z"] < -1.96:
+        st.warning("The residuals of the best model still follow a systematic trend (runs test); "
+                   "none of the candidates may describe the data well.")
+
+    table = ranking[["rank", "model", criterion, "delta", "weight", "R2", "RMSE", "runs_z", "params"]].copy()
+    table["params"] = table["params"].map(lambda params: ", ".join(f"{k} = {v:.4g}" for k, v in params.items()))
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+    order = np.argsort(p)
+    p_fit = np.linspace(np.nanmin(p[p > 0]) if (p > 0).any() else 0.0, np.nanmax(p), 200)
+    fig = go.Figure(go.Scatter(x=p[order], y=q[order], mode='markers', name="Measured"))
+    for row in ranking.head(3).itertuples():
+        q_fit = fitting.predict(row.model, p_fit, list(row.params.values()), T=T, p0=p0)
+        fig.add_trace(go.Scatter(x=p_fit, y=q_fit, mode='lines', name=f"{row.rank}. {row.model}"))
+    fig.update_layout(title="Measured Data and Top-ranked Fits", xaxis_title="Pressure", yaxis_title="Uptake")
+    st.plotly_chart(fig, use_container_width=True)
+
 def app():
     st.title("Model Recommendation")
+    mode = st.radio("Recommendation Mode", ["Guided questionnaire", "From measured data"], horizontal=True)
+    if mode == "From measured data":
+        data_recommendation()
+        return
     st.markdown("""
     **Instructions:**  
     Choose the nature of your adsorbent, the type of adsorption, and specify if adsorbate–adsorbate interactions are present.  
@@ -0,0 +1,175 @@
+"""
+Data-driven isotherm model selection.
+
+Every candidate model is fitted with the batched solver of `fitting`, then
+ranked by information criteria (AICc by default) with residual diagnostics
+to flag systematic misfit. Datasets are handled as padded batches, so ranking
+one uploaded isotherm and ranking a whole directory of files share one code
+path:
+
+    python model_selection.py data/ -o ranking.csv --workers 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fitting import as_batch, fit_batch, predict, valid_mask
+
+CANDIDATE_MODELS = ("Langmuir", "BET", "Freundlich", "Temkin", "Sips", "Toth")
+CRITERIA = ("AICc", "AIC", "BIC")
+ISOTHERM_SUFFIXES = (".csv", ".parquet")
+
+
+def read_isotherm(path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pressure and uptake from the first two numeric columns of a CSV or Parquet file.
+    """
+    path = Path(path)
+    frame = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    numeric = frame.select_dtypes("number")
+    if numeric.shape[1] < 2:
+        raise ValueError(f"{path.name}: expected two numeric columns (pressure, uptake)")
+    return numeric.iloc[:, 0].to_numpy(float), numeric.iloc[:, 1].to_numpy(float)
+
+
+def information_criteria(rss, n, k) -> dict:
+    """
+    AIC, small-sample AICc and BIC of least-squares fits.
+
+    `k` counts the model parameters; the residual variance adds one more.
+    """
+    rss, n = np.asarray(rss, dtype=float), np.asarray(n, dtype=float)
+    K = k + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_likelihood = n * np.log(np.maximum(rss, 1e-300) / n)
+        aic = log_likelihood + 2 * K
+        aicc = np.where(n - K - 1 > 0, aic + 2 * K * (K + 1) / (n - K - 1), np.inf)
+        bic = log_likelihood + K * np.log(n)
+    return {"AIC": aic, "AICc": aicc, "BIC": bic}
+
+
+def residual_diagnostics(residuals: np.ndarray, mask: np.ndarray, uptakes: np.ndarray) -> dict:
+    """
+    R², RMSE and the Wald-Wolfowitz runs test on residual signs per dataset.
+
+    Residuals must be ordered by pressure. A strongly negative runs z-score
+    (too few sign changes) means the model misses the curvature of the data.
+    """
+    n = mask.sum(axis=1)
+    r = np.where(mask, residuals, 0.0)
+    q = np.where(mask, uptakes, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q_mean = q.sum(axis=1) / n
+        ss_tot = (np.where(mask, uptakes - q_mean[:, None], 0.0) ** 2).sum(axis=1)
+        rss = (r**2).sum(axis=1)
+        positive = (mask & (r > 0)).sum(axis=1)
+        negative = n - positive
+        signs = np.sign(r)
+        both = mask[:, 1:] & mask[:, :-1]
+        runs = 1 + (both & (signs[:, 1:] != signs[:, :-1])).sum(axis=1)
+        expected = 2 * positive * negative / n + 1
+        variance = (expected - 1) * (expected - 2) / (n - 1)
+        runs_z = np.where(variance > 0, (runs - expected) / np.sqrt(variance), 0.0)
+        return {"R2": 1 - rss / ss_tot, "RMSE": np.sqrt(rss / n), "runs_z": runs_z}
+
+
+def rank_batch(pressures, uptakes, *, T=298.0, p0=None, models=CANDIDATE_MODELS,
+               criterion: str = "AICc", names=None) -> pd.DataFrame:
+    """
+    Fit every model to every dataset and rank the models per dataset.
+
+    All models of a dataset are fitted and scored on the same points: those
+    valid for every candidate (e.g. p > 0 and, with BET, p < p0), so the
+    information criteria compare the models on identical data.
+    Returns one row per (dataset, model) with the fitted parameters, RSS,
+    information criteria, residual diagnostics, the criterion difference to
+    the best model ("delta"), Akaike/Schwarz weights and the rank (1 = best).
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion: {criterion!r}")
+    p = as_batch(pressures)
+    q = as_batch(uptakes, width=p.shape[1])
+    n_data = len(p)
+    T = np.broadcast_to(np.asarray(T, dtype=float), (n_data,))
+    if p0 is None:
+        p0 = 1.05 * np.nanmax(np.where(np.isfinite(p), p, -np.inf), axis=1)
+    p0 = np.broadcast_to(np.asarray(p0, dtype=float), (n_data,))
+    # Drop points any candidate cannot use, then order by pressure (NaN
+    # padding last) for the runs test.
+    mask = np.logical_and.reduce([valid_mask(model, p, q, p0[:, None]) for model in models])
+    p, q = np.where(mask, p, np.nan), np.where(mask, q, np.nan)
+    order = np.argsort(np.where(mask, p, np.inf), axis=1, kind="stable")
+    p, q, mask = (np.take_along_axis(a, order, axis=1) for a in (p, q, mask))
+    names = list(range(n_data)) if names is None else list(names)
+
+    frames = []
+    for model in models:
+        fit = fit_batch(model, p, q, T=T, p0=p0)
+        q_hat = predict(model, p, fit["params"], T=T, p0=p0).reshape(p.shape)
+        diagnostics = residual_diagnostics(q_hat - q, mask, q)
+        criteria = information_criteria(fit["rss"], fit["n_points"], len(fit["param_names"]))
+        frame = pd.DataFrame({"dataset": names, "model": model, "n_points": fit["n_points"],
+                              "rss": fit["rss"], **criteria, **diagnostics, "converged": fit["converged"]})
+        frame["params"] = [dict(zip(fit["param_names"], row.tolist())) for row in fit["params"]]
+        frames.append(frame)
+
+    table = pd.concat(frames, ignore_index=True)
+    score = table[criterion].where(np.isfinite(table[criterion]) & table["converged"], np.inf)
+    table["delta"] = score - score.groupby(table["dataset"]).transform("min")
+    likelihood = np.exp(-0.5 * table["delta"])
+    table["weight"] = likelihood / likelihood.groupby(table["dataset"]).transform("sum")
+    table["rank"] = table.assign(_score=score).groupby("dataset")["_score"].rank(method="first").astype(int)
+    return table.sort_values(["dataset", "rank"], ignore_index=True)
+
+
+def _rank_files(args):
+    paths, options = args
+    data = [read_isotherm(path) for path in paths]
+    return rank_batch([p for p, _ in data], [q for _, q in data],
+                      names=[Path(path).name for path in paths], **options)
+
+
+def rank_directory(directory, *, workers: int | None = None, chunk_size: int = 200, **options) -> pd.DataFrame:
+    """
+    Rank the candidate models for every isotherm file in a directory.
+
+    Files are split into chunks that are read, fitted and ranked in a process
+    pool; `options` are passed to `rank_batch` (T, p0, models, criterion).
+    """
+    paths = sorted(str(path) for path in Path(directory).iterdir() if path.suffix in ISOTHERM_SUFFIXES)
+    if not paths:
+        raise FileNotFoundError(f"No .csv or .parquet isotherm files in {directory}")
+    tasks = [(paths[i:i + chunk_size], options) for i in range(0, len(paths), chunk_size)]
+    if workers == 1 or len(tasks) == 1:
+        parts = [_rank_files(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_rank_files, tasks))
+    return pd.concat(parts, ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank isotherm models for a directory of measured isotherms.")
+    parser.add_argument("directory", help="Directory of .csv/.parquet files with pressure and uptake columns")
+    parser.add_argument("-o", "--output", default="model_ranking.csv", help="Output CSV file")
+    parser.add_argument("--criterion", choices=CRITERIA, default="AICc", help="Ranking criterion")
+    parser.add_argument("--temperature", type=float, default=298.0, help="Temperature (K) for the Temkin model")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Files per worker task")
+    args = parser.parse_args(argv)
+
+    table = rank_directory(args.directory, workers=args.workers, chunk_size=args.chunk_size,
+                           T=args.temperature, criterion=args.criterion)
+    table.to_csv(args.output, index=False)
+    best = table[table["rank"] == 1]["model"].value_counts()
+    print(f"Ranked {table['dataset'].nunique()} isotherms; best models: "
+          + ", ".join(f"{model} ({count})" for model, count in best.items()))
+    print(f"Wrote ranking to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Lazy loading of page modules.
+
+Page modules (and the heavy libraries they import) are only imported the first
+time a page is shown. After the first page has rendered, the remaining pages
+can be imported in a background thread so later navigation is instant.
+Within a page, libraries that only opt-in sections need are bound with
+`lazy_module` and imported when one of those sections first uses them.
+
+Cold-start import costs can be inspected with
+
+    python page_registry.py --report
+
+which imports every page in a fresh interpreter under `-X importtime` and lists
+the modules with the largest cumulative import time.
+"""
+import argparse
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+# Define available pages and corresponding module names
+PAGES = {
+    "Learning Objectives": "learning_objectives",
+    "Theory": "theory",
+    "Simulation": "simulation",
+    "Model Recommendation": "model_recommendation", 
+    #"Data Analysis": "data_analysis",
+    "Case Studies": "case_studies",
+    "Quiz": "quiz"
+}
+
+_modules = {}
+_load_times = {}
+_page_locks = {}  # module name -> lock held while that page is imported
+_lock = threading.Lock()  # guards _page_locks and _load_times, never held during an import
+_warm_thread = None
+
+
+def _page_lock(module_name: str) -> threading.Lock:
+    with _lock:
+        return _page_locks.setdefault(module_name, threading.Lock())
+
+
+def load_page(module_name: str):
+    """
+    Import a page module on first use and return it.
+
+    Each page has its own lock, so opening a page never waits for the
+    background warm-up to finish importing a different one.
+    """
+    module = _modules.get(module_name)
+    if module is not None:
+        return module
+    with _page_lock(module_name):
+        if module_name not in _modules:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            with _lock:
+                _load_times[module_name] = time.perf_counter() - start
+            _modules[module_name] = module
+        return _modules[module_name]
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Bind a module at page import time without importing it yet.
+    """
+    return LazyModule(name)
+
+
+def warm_pages(module_names):
+    """
+    Import the given page modules in a background thread, once per process.
+    """
+    global _warm_thread
+    if _warm_thread is not None:
+        return
+    pending = [name for name in module_names if name not in _modules]
+
+    def warm():
+        for name in pending:
+            try:
+                load_page(name)
+            except Exception:
+                # A broken page must not take the warm-up of the others down;
+                # the error resurfaces when the page is actually opened.
+                pass
+
+    _warm_thread = threading.Thread(target=warm, name="page-warmup", daemon=True)
+    _warm_thread.start()
+
+
+def load_times() -> dict:
+    """
+    Seconds spent importing each page module in this process.
+    """
+    with _lock:
+        return dict(_load_times)
+
+
+def _importtime(code: str) -> tuple[list[dict], subprocess.CompletedProcess]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append({"module": name, "self_ms": int(self_us) / 1000,
+                     "cumulative_ms": int(cumulative_us) / 1000})
+    return rows, result
+
+
+def import_report(module_name: str, top: int = 15) -> list[dict]:
+    """
+    Profile a cold import of one module in a fresh interpreter.
+
+    Returns the `top` modules by cumulative import time, each as a dict with
+    `module`, `self_ms` and `cumulative_ms`. Modules imported by interpreter
+    startup itself are left out.
+    """
+    startup, _ = _importtime("pass")
+    startup = {row["module"] for row in startup}
+    rows, result = _importtime(f"import {module_name}")
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise ImportError(f"Importing {module_name} failed: {error}")
+    rows = [row for row in rows if row["module"].strip() not in startup]
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold-start import cost per page.")
+    parser.add_argument("--report", action="store_true", help="Profile every page module")
+    parser.add_argument("--top", type=int, default=10, help="Modules listed per page")
+    args = parser.parse_args(argv)
+    if not args.report:
+        parser.print_help()
+        return
+    for title, module_name in PAGES.items():
+        try:
+            rows = import_report(module_name, top=args.top)
+        except ImportError as e:
+            print(f"{title} ({module_name}): {e}")
+            continue
+        total = rows[0]["cumulative_ms"] if rows else 0.0
+        print(f"{title} ({module_name}): {total:.1f} ms")
+        for row in rows:
+            print(f"  {row['cumulative_ms']:9.1f} ms  {row['self_ms']:8.1f} ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
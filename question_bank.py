@@ -0,0 +1,101 @@
+"""
+Indexed quiz question bank.
+
+The bank is built once per process and indexes questions by the explicit
+"topic" (the isotherm model a question is about, or "General") and
+"difficulty" fields every item carries. Drawing a quiz costs
+O(quiz length), independent of the bank size, so the bank can grow to tens
+of thousands of items without slowing down page reruns.
+"""
+import json
+import numpy as np
+
+TOPICS = ("Langmuir", "BET", "Freundlich", "Temkin")
+GENERAL_TOPIC = "General"
+DIFFICULTIES = ("basic", "applied")
+
+
+class QuestionBank:
+    """
+    Immutable question store with a (topic, difficulty) index.
+
+    Every item needs a "topic" from TOPICS or GENERAL_TOPIC and a "difficulty"
+    from DIFFICULTIES. Questions whose text repeats an earlier item are stored
+    once.
+    """
+
+    def __init__(self, questions):
+        self.items = []
+        seen = set()
+        strata = {}
+        for question in questions:
+            if question["question"] in seen:
+                continue
+            seen.add(question["question"])
+            topic, level = question.get("topic"), question.get("difficulty")
+            if topic not in (*TOPICS, GENERAL_TOPIC) or level not in DIFFICULTIES:
+                raise ValueError(f"Question {question['question']!r} has topic {topic!r} and difficulty {level!r}; "
+                                 f"expected one of {', '.join((*TOPICS, GENERAL_TOPIC))} and "
+                                 f"{', '.join(DIFFICULTIES)}")
+            strata.setdefault((topic, level), []).append(len(self.items))
+            self.items.append(question)
+        self.index = {key: np.array(ids, dtype=np.int64) for key, ids in strata.items()}
+        self.ids = {item["question"]: item_id for item_id, item in enumerate(self.items)}
+
+    @classmethod
+    def from_jsonl(cls, path, questions=()):
+        """
+        Build a bank from `questions` plus one JSON question object per line of `path`.
+        """
+        def read():
+            yield from questions
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+        return cls(read())
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, item_id: int) -> dict:
+        return self.items[item_id]
+
+    @property
+    def topics(self) -> list[str]:
+        return sorted({topic for topic, _ in self.index})
+
+    @property
+    def difficulties(self) -> list[str]:
+        return [level for level in DIFFICULTIES if any(d == level for _, d in self.index)]
+
+    def count(self, topics=None, difficulties=None) -> int:
+        """
+        Number of items matching the topic and difficulty filters (None = all).
+        """
+        return sum(len(ids) for ids in self._strata(topics, difficulties))
+
+    def empty_strata(self, topics, difficulties) -> list[tuple[str, str]]:
+        """
+        The selected (topic, difficulty) combinations that have no items.
+        """
+        return [(topic, level) for topic in topics for level in difficulties if (topic, level) not in self.index]
+
+    def _strata(self, topics, difficulties):
+        return [ids for (topic, level), ids in self.index.items()
+                if (topics is None or topic in topics) and (difficulties is None or level in difficulties)]
+
+    def sample(self, n: int, rng: np.random.Generator, topics=None, difficulties=None) -> list[int]:
+        """
+        Draw up to `n` distinct item ids uniformly from the matching strata.
+
+        Positions are drawn in the concatenated strata and mapped back with a
+        binary search, so no candidate list of the bank's size is built.
+        """
+        strata = self._strata(topics, difficulties)
+        sizes = np.cumsum([len(ids) for ids in strata])
+        total = int(sizes[-1]) if len(sizes) else 0
+        positions = rng.choice(total, size=min(n, total), replace=False)
+        which = np.searchsorted(sizes, positions, side="right")
+        offsets = positions - np.concatenate([[0], sizes[:-1]])[which]
+        return [int(strata[s][o]) for s, o in zip(which, offsets)]
@@ -1,5 +1,16 @@
+import functools
+import json
+import os
+import secrets
+import numpy as np
 import streamlit as st
-import random
+from question_bank import QuestionBank
+
+QUIZ_LENGTH = 8
+# Optional JSONL file with additional questions (one question object per line)
+QUIZ_BANK_PATH = os.environ.get("QUIZ_BANK_PATH")
+# Optional JSONL file that submissions are appended to, for grading.py
+QUIZ_LOG_PATH = os.environ.get("QUIZ_LOG_PATH")
 
 def get_quiz_questions():
     # List of 50 unique questions on Langmuir, BET, Temkin, and Freundlich isotherms
@@ -12,7 +23,9 @@ def get_quiz_questions():
                 "Random adsorption with no defined behavior",
                 "Adsorption with chemical reaction"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which model is most appropriate for multilayer adsorption?",
@@ -22,7 +35,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "The Freundlich isotherm is used for:",
@@ -32,7 +47,9 @@ def get_quiz_questions():
                 "Micropore filling",
                 "No adsorption"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "What does a negative ΔH indicate in adsorption?",
@@ -42,7 +59,9 @@ def get_quiz_questions():
                 "No heat change",
                 "Irreversible adsorption"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "General",
+            "difficulty": "basic"
         },
         {
             "question": "A high surface area generally leads to:",
@@ -52,7 +71,9 @@ def get_quiz_questions():
                 "No effect",
                 "Increased desorption"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "General",
+            "difficulty": "applied"
         },
         {
             "question": "Which isotherm assumes a linear decrease in adsorption heat?",
@@ -62,7 +83,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "The BET isotherm is an extension of which model?",
@@ -72,7 +95,9 @@ def get_quiz_questions():
                 "Temkin",
                 "Henry's Law"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is empirical and describes adsorption on heterogeneous surfaces?",
@@ -82,7 +107,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "What is the primary assumption of the Langmuir isotherm?",
@@ -92,7 +119,9 @@ def get_quiz_questions():
                 "Adsorption heat decreases linearly",
                 "Surface is heterogeneous"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is suitable for describing adsorption in micropores?",
@@ -102,7 +131,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm equation describe?",
@@ -112,7 +143,9 @@ def get_quiz_questions():
                 "Logarithmic adsorption",
                 "Power-law adsorption"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm accounts for adsorbate–adsorbate interactions?",
@@ -122,7 +155,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "What is the main limitation of the Langmuir isotherm?",
@@ -132,7 +167,9 @@ def get_quiz_questions():
                 "It ignores adsorbate–adsorbate interactions",
                 "All of the above"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption at low pressures?",
@@ -142,7 +179,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the BET isotherm assume about the surface?",
@@ -152,7 +191,9 @@ def get_quiz_questions():
                 "It has micropores",
                 "It is non-porous"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is used for describing adsorption at high pressures?",
@@ -162,7 +203,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Temkin isotherm assume about adsorption heat?",
@@ -172,7 +215,9 @@ def get_quiz_questions():
                 "It increases exponentially",
                 "It is negligible"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is most suitable for describing chemisorption?",
@@ -182,7 +227,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm constant 'n' represent?",
@@ -192,7 +239,9 @@ def get_quiz_questions():
                 "Surface heterogeneity",
                 "Heat of adsorption"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing physical adsorption?",
@@ -202,7 +251,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Langmuir isotherm equation describe?",
@@ -212,7 +263,9 @@ def get_quiz_questions():
                 "Saturation adsorption",
                 "Power-law adsorption"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is used for describing adsorption on non-ideal surfaces?",
@@ -222,7 +275,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the BET isotherm equation describe?",
@@ -232,7 +287,9 @@ def get_quiz_questions():
                 "Micropore filling",
                 "Chemisorption"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm assumes that adsorption sites are energetically equivalent?",
@@ -242,7 +299,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "What does the Freundlich isotherm describe about adsorption sites?",
@@ -252,7 +311,9 @@ def get_quiz_questions():
                 "They are non-porous",
                 "They are chemically reactive"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption at intermediate pressures?",
@@ -262,7 +323,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Temkin isotherm assume about adsorbate–adsorbate interactions?",
@@ -272,7 +335,9 @@ def get_quiz_questions():
                 "They are constant",
                 "They are random"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on porous materials?",
@@ -282,7 +347,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Langmuir isotherm assume about adsorption sites?",
@@ -292,7 +359,9 @@ def get_quiz_questions():
                 "They are non-interacting",
                 "They are chemically reactive"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption at low concentrations?",
@@ -302,7 +371,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm assume about adsorption heat?",
@@ -312,7 +383,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on non-porous materials?",
@@ -322,7 +395,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the BET isotherm assume about adsorption layers?",
@@ -332,7 +407,9 @@ def get_quiz_questions():
                 "They are limited to multilayers",
                 "They are random"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with varying site energies?",
@@ -342,7 +419,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Temkin isotherm assume about adsorption sites?",
@@ -352,7 +431,9 @@ def get_quiz_questions():
                 "They are non-interacting",
                 "They are chemically reactive"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption at high concentrations?",
@@ -362,7 +443,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm assume about adsorption capacity?",
@@ -372,7 +455,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with strong adsorbate–adsorbate interactions?",
@@ -382,7 +467,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Temkin",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Langmuir isotherm assume about adsorbate–adsorbate interactions?",
@@ -392,7 +479,9 @@ def get_quiz_questions():
                 "They are constant",
                 "They are random"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with weak adsorbate–adsorbate interactions?",
@@ -402,7 +491,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the BET isotherm assume about adsorption heat?",
@@ -412,7 +503,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with moderate adsorbate–adsorbate interactions?",
@@ -422,7 +515,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 3
+            "correct": 3,
+            "topic": "Temkin",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm assume about adsorption sites?",
@@ -432,7 +527,9 @@ def get_quiz_questions():
                 "They are non-interacting",
                 "They are chemically reactive"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with strong adsorbate–surface interactions?",
@@ -442,7 +539,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Temkin isotherm assume about adsorption capacity?",
@@ -452,7 +551,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with weak adsorbate–surface interactions?",
@@ -462,7 +563,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Langmuir isotherm assume about adsorption capacity?",
@@ -472,7 +575,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with moderate adsorbate–surface interactions?",
@@ -482,7 +587,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the BET isotherm assume about adsorption capacity?",
@@ -492,7 +599,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "BET",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with strong adsorbate–surface interactions?",
@@ -502,7 +611,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 0
+            "correct": 0,
+            "topic": "Langmuir",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Freundlich isotherm assume about adsorption heat?",
@@ -512,7 +623,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Freundlich",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with weak adsorbate–surface interactions?",
@@ -522,7 +635,9 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
         {
             "question": "What does the Temkin isotherm assume about adsorption heat?",
@@ -532,7 +647,9 @@ def get_quiz_questions():
                 "It is negligible",
                 "It is linear"
             ],
-            "correct": 1
+            "correct": 1,
+            "topic": "Temkin",
+            "difficulty": "basic"
         },
         {
             "question": "Which isotherm is best for describing adsorption on surfaces with moderate adsorbate–surface interactions?",
@@ -542,34 +659,88 @@ def get_quiz_questions():
                 "Freundlich",
                 "Temkin"
             ],
-            "correct": 2
+            "correct": 2,
+            "topic": "Freundlich",
+            "difficulty": "applied"
         },
     ]
     return questions
 
+@functools.cache
+def question_bank() -> QuestionBank:
+    """
+    The question bank, built once per process and shared by all sessions.
+    """
+    if QUIZ_BANK_PATH:
+        return QuestionBank.from_jsonl(QUIZ_BANK_PATH, get_quiz_questions())
+    return QuestionBank(get_quiz_questions())
+
+def new_quiz(bank: QuestionBank, topics, difficulties, seed: int | None = None) -> dict:
+    """
+    Draw a quiz and its choice orders from a seed; stored in session state.
+
+    "empty" lists the selected topic and difficulty combinations without any questions.
+    """
+    seed = secrets.randbits(64) if seed is None else seed
+    rng = np.random.default_rng(seed)
+    item_ids = bank.sample(QUIZ_LENGTH, rng, topics, difficulties)
+    return {
+        "seed": seed,
+        "filters": (tuple(topics), tuple(difficulties)),
+        "empty": bank.empty_strata(topics, difficulties),
+        "items": [(item_id, rng.permutation(len(bank[item_id]["choices"])).tolist()) for item_id in item_ids],
+    }
+
+def log_submission(answers):
+    """
+    Append this session's submission to the response log.
+    """
+    student = st.session_state.setdefault("quiz_student", secrets.token_hex(8))
+    record = {"student": student,
+              "answers": [{"question": ans["question"], "choice": ans["user_choice"]} for ans in answers]}
+    with open(QUIZ_LOG_PATH, "a", encoding="utf-8") as log:
+        log.write(json.dumps(record, ensure_ascii=False) + "\n")
+
 def app():
     st.title("Quiz: Test Your Adsorption Knowledge")
-    questions = get_quiz_questions()
-    selected_questions = random.sample(questions, 8)
+    bank = question_bank()
+    filter_cols = st.columns(2)
+    topics = filter_cols[0].multiselect("Topics", bank.topics, default=bank.topics)
+    difficulties = filter_cols[1].multiselect("Difficulty", bank.difficulties, default=bank.difficulties)
+
+    # The quiz is only redrawn on request or when the filters change; reruns re-render it.
+    redraw = st.button("New Quiz")
+    quiz = st.session_state.get("quiz")
+    if redraw or quiz is None or quiz["filters"] != (tuple(topics), tuple(difficulties)):
+        quiz = st.session_state["quiz"] = new_quiz(bank, topics, difficulties)
+    if quiz["empty"]:
+        missing = ", ".join(f"{topic} ({level})" for topic, level in quiz["empty"])
+        st.warning(f"The question bank has no questions for {missing}.")
+    if not quiz["items"]:
+        st.info("No questions match the selected topics and difficulty.")
+        return
+
     user_answers = {}
-    for idx, q in enumerate(selected_questions):
+    for idx, (item_id, order) in enumerate(quiz["items"]):
+        q = bank[item_id]
         st.markdown(f"**Question {idx+1}:** {q['question']}")
-        choices = q["choices"].copy()
-        random.shuffle(choices)
+        choices = [q["choices"][i] for i in order]
         correct_answer = q["choices"][q["correct"]]
 
         user_choice = st.radio(
             f"Select your answer for Question {idx+1}:",
             choices,
-            key=f"quiz_q{idx}",
+            key=f"quiz_{quiz['seed']}_q{idx}",
             index=0  # No default selection
         )
-        user_answers[idx] = {"user_choice": user_choice, "correct_answer": correct_answer}
+        user_answers[idx] = {"question": q["question"], "user_choice": user_choice, "correct_answer": correct_answer}
         st.write("---")
 
     if st.button("Submit Quiz"):
         score = sum(1 for ans in user_answers.values() if ans["user_choice"] == ans["correct_answer"])
-        st.success(f"You scored {score} out of {len(selected_questions)}!")
+        st.success(f"You scored {score} out of {len(quiz['items'])}!")
+        if QUIZ_LOG_PATH:
+            log_submission(user_answers.values())
         st.markdown("### Detailed Feedback")
         for idx, ans in user_answers.items():
             feedback = "Correct" if ans["user_choice"] == ans["correct_answer"] else f"Incorrect. The correct answer is: **{ans['correct_answer']}**."
@@ -0,0 +1,209 @@
+"""
+On-disk store for sweep results with slice queries.
+
+A store is a directory holding the grid as one raw C-ordered array file
+(`values.bin`) and a JSON sidecar (`meta.json`) with the dtype, shape, axis
+values, model and constants. The array is opened with `np.memmap`, so a
+query reads only the pages behind the requested slice: with pressure as the
+last axis an isotherm is one contiguous row, a P x T surface is one row per
+temperature and an isobar is one value per row. Sweeps are written in row
+blocks by the worker processes of `sweep` straight into the file:
+
+    python resultstore.py sweeps/langmuir Langmuir --T 250:400:200 --deltaH=-40:-10:50 --deltaS=-100:-20:50 --P 0:10:500
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+VALUES_FILE = "values.bin"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+# Default directory that the Simulation page offers to read stores from.
+RESULT_STORE_DIR = Path(os.environ.get("RESULT_STORE_DIR", "sweeps"))
+
+
+class ResultStore:
+    """
+    Memory-mapped sweep grid with named axes.
+
+    `values` is the np.memmap of the whole grid; `axes` maps axis names (in
+    SWEEP_AXES order, pressure last) to their values and `attrs` holds the
+    model, its constants and the values of axes that were held fixed.
+    """
+
+    def __init__(self, path, values: np.memmap, axes: dict, attrs: dict):
+        self.path = Path(path)
+        self.values = values
+        self.axes = axes
+        self.attrs = attrs
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    @classmethod
+    def create(cls, path, axes: dict, *, dtype=np.float32, attrs: dict | None = None) -> "ResultStore":
+        """
+        Allocate a new store for the grid spanned by `axes`; the values are uninitialized.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        axes = {name: np.asarray(values, dtype=float).ravel() for name, values in axes.items()}
+        shape = tuple(len(values) for values in axes.values())
+        values = np.memmap(path / VALUES_FILE, dtype=dtype, mode="w+", shape=shape)
+        store = cls(path, values, axes, dict(attrs or {}, complete=False))
+        store.write_meta()
+        return store
+
+    @classmethod
+    def open(cls, path, mode: str = "r") -> "ResultStore":
+        """
+        Map an existing store read-only (or "r+" to modify it).
+        """
+        path = Path(path)
+        meta = read_meta(path)
+        axes = {name: np.asarray(values, dtype=float) for name, values in meta["axes"].items()}
+        values = np.memmap(path / VALUES_FILE, dtype=meta["dtype"], mode=mode, shape=tuple(meta["shape"]))
+        return cls(path, values, axes, meta["attrs"])
+
+    def write_meta(self):
+        meta = {"format": FORMAT_VERSION, "dtype": self.values.dtype.str, "shape": list(self.shape),
+                "axes": {name: values.tolist() for name, values in self.axes.items()}, "attrs": self.attrs}
+        (self.path / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+    def index(self, name: str, value: float) -> int:
+        """
+        Position of the axis value closest to `value`.
+        """
+        if name not in self.axes:
+            raise KeyError(f"{self.path}: no axis {name!r} (axes: {', '.join(self.axes)})")
+        return int(np.abs(self.axes[name] - value).argmin())
+
+    def select(self, **fixed) -> tuple[dict, np.ndarray]:
+        """
+        Slice the grid by holding axes at the values closest to the given ones.
+
+        Axes that are not named stay whole, e.g. `select(T=300, deltaH=-20,
+        deltaS=-60)` on a (T, ΔH, ΔS, P) grid is one isotherm and leaving out T
+        as well gives a P x T surface. Returns the remaining axes (with the
+        actually selected values of the fixed axes under "fixed") and the
+        slice as a memory-mapped view; copy it with np.asarray to load it.
+        """
+        index, remaining, chosen = [], {}, {}
+        for name, values in self.axes.items():
+            if name in fixed:
+                i = self.index(name, fixed.pop(name))
+                index.append(i)
+                chosen[name] = float(values[i])
+            else:
+                index.append(slice(None))
+                remaining[name] = values
+        if fixed:
+            raise KeyError(f"{self.path}: no axes {sorted(fixed)} (axes: {', '.join(self.axes)})")
+        return {**remaining, "fixed": chosen}, self.values[tuple(index)]
+
+    def isotherm(self, **fixed) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pressure axis and uptake with every other axis held at the given values.
+        """
+        axes, values = self.select(**fixed)
+        if values.ndim != 1:
+            missing = [name for name in axes if name not in ("P", "fixed")]
+            raise ValueError(f"An isotherm needs values for {', '.join(missing)}")
+        return axes["P"], np.asarray(values)
+
+    def surface(self, **fixed) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pressure axis, temperature axis and the (T, P) uptake grid at the given values.
+        """
+        if "T" not in self.axes:
+            raise ValueError(f"{self.path}: the store has no temperature axis")
+        axes, values = self.select(**fixed)
+        if values.ndim != 2:
+            raise ValueError("A surface needs values for every axis except T and P")
+        return axes["P"], axes["T"], values
+
+    def flush(self):
+        self.values.flush()
+
+
+def read_meta(path) -> dict:
+    """
+    The metadata sidecar of a store.
+    """
+    path = Path(path)
+    meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported result store format {meta.get('format')!r}")
+    return meta
+
+
+def list_stores(directory=RESULT_STORE_DIR, *, axes=()) -> list[Path]:
+    """
+    Complete stores directly below `directory` that have all of `axes`, sorted by name.
+
+    Stores of cancelled sweeps and unreadable sidecars are skipped.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    stores = []
+    for path in sorted(directory.iterdir()):
+        if not (path / META_FILE).is_file():
+            continue
+        try:
+            meta = read_meta(path)
+        except (OSError, ValueError):
+            continue
+        if meta["attrs"].get("complete") and set(axes) <= set(meta["axes"]):
+            stores.append(path)
+    return stores
+
+
+def sweep_to_store(path, model: str, axes: dict, *, workers: int | None = None, dtype=np.float32,
+                   block_points: int | None = None, progress=None, cancel: threading.Event | None = None,
+                   **params) -> ResultStore:
+    """
+    Run `sweep.sweep_grid` with the output written into a new store at `path`.
+
+    The workers map the store file themselves, so the grid never has to fit
+    in memory. A cancelled sweep leaves the store marked incomplete.
+    `block_points` defaults to `sweep.BLOCK_POINTS`.
+    """
+    # Imported here: reading stores must not pull in the process pool machinery.
+    from sweep import BLOCK_POINTS, prepare_sweep, run_blocks
+
+    block_points = BLOCK_POINTS if block_points is None else block_points
+    ordered, fixed, params = prepare_sweep(model, axes, params)
+    store = ResultStore.create(path, ordered, dtype=dtype,
+                               attrs={"model": model, "params": params,
+                                      "fixed": {name: value for name, value in fixed.items() if name not in ordered}})
+    run_blocks(("memmap", str(store.path / VALUES_FILE)), store.values, ordered, fixed, model, params,
+               workers=workers, block_points=block_points, progress=progress, cancel=cancel)
+    store.flush()
+    store.attrs["complete"] = True
+    store.write_meta()
+    return ResultStore.open(path)
+
+
+def main(argv=None):
+    from sweep import add_sweep_arguments, print_progress, sweep_from_args
+
+    parser = argparse.ArgumentParser(description="Run an isotherm sweep into an on-disk result store.")
+    parser.add_argument("path", help="Store directory")
+    add_sweep_arguments(parser)
+    args = parser.parse_args(argv)
+    axes, constants = sweep_from_args(parser, args)
+    start = time.perf_counter()
+
+    store = sweep_to_store(args.path, args.model, axes, workers=args.workers, progress=print_progress, **constants)
+    print(f"\nWrote grid {store.shape} to {store.path} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
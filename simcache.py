@@ -0,0 +1,117 @@
+import threading
+import numpy as np
+from cachetools import TTLCache
+
+# Results are shared by every session served by this process.
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_TTL_SECONDS = 30 * 60
+
+# Parameters that only influence one model; dropped from the key otherwise.
+MODEL_SPECIFIC = {"n": "Freundlich", "C": "BET", "b": "Temkin"}
+
+
+def _nbytes(value) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value) or 1
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values()) or 1
+    return 64
+
+
+_cache = TTLCache(maxsize=CACHE_MAX_BYTES, ttl=CACHE_TTL_SECONDS, getsizeof=_nbytes)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _normalize(value):
+    """
+    Make a parameter value hashable and insensitive to float noise.
+    """
+    if isinstance(value, (tuple, list, np.ndarray)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, (float, np.floating)):
+        return float(f"{value:.12g}")
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def simulation_key(model: str, **params) -> tuple:
+    """
+    Build a normalized cache key from simulation parameters.
+
+    Model-specific constants (n, C, b) are only part of the key for the model
+    that uses them, so changing an inactive input does not miss the cache.
+    """
+    items = []
+    for name, value in sorted(params.items()):
+        if MODEL_SPECIFIC.get(name, model) != model:
+            continue
+        items.append((name, _normalize(value)))
+    return (model,) + tuple(items)
+
+
+def _freeze(value):
+    """
+    Mark cached arrays read-only so one session cannot mutate another's result.
+    """
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+
+def cached(kind: str, key: tuple, compute):
+    """
+    Return the cached result for (kind, key), computing and storing it on a miss.
+    """
+    full_key = (kind,) + key
+    with _lock:
+        try:
+            value = _cache[full_key]
+            _stats["hits"] += 1
+            return value
+        except KeyError:
+            _stats["misses"] += 1
+    value = _freeze(compute())
+    with _lock:
+        try:
+            _cache[full_key] = value
+        except ValueError:
+            # Larger than the whole cache; serve it without storing.
+            pass
+    return value
+
+
+def cache_info() -> dict:
+    """
+    Return hit/miss counters and current cache occupancy.
+    """
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "entries": len(_cache),
+            "bytes": _cache.currsize,
+            "max_bytes": _cache.maxsize,
+        }
+
+
+def clear_cache():
+    """
+    Drop all cached results and reset the counters.
+    """
+    with _lock:
+        _cache.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
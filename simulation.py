@@ -1,7 +1,53 @@
+import hashlib
 import streamlit as st
 import numpy as np
-import plotly.graph_objects as go
-from utils import get_download_link, create_3d_surface, langmuir_isotherm
+from isotherms import material_isotherms
+from grids import pressure_grid
+from surface import surface_data, decimate
+from simcache import cached, simulation_key
+from thermo import equilibrium_constant
+from metrics import fragment_timer, timed
+from tracing import span
+from page_registry import lazy_module
+
+# Only needed by the figures and the opt-in overlay, store and export features; imported on first use.
+go = lazy_module("plotly.graph_objects")
+pa = lazy_module("pyarrow")
+export = lazy_module("export")
+measurements = lazy_module("measurements")
+resultstore = lazy_module("resultstore")
+
+def compute_isotherm(model_type, T, P_max, qmax, deltaH, deltaS, n, C_BET, b, tol):
+    """
+    Compute the adaptive pressure grid and isotherm for one parameter set.
+    """
+    K = equilibrium_constant(T, deltaH, deltaS)
+    return pressure_grid(model_type, P_max, tol=tol, K=K, qmax=qmax, n=n, C=C_BET, b=b, T=T, p0=P_max)
+
+# Labels of the sweep axes a result store slice can be taken along.
+STORE_AXIS_LABELS = {"T": "Temperature (K)", "deltaH": "Enthalpy (ΔH, kJ/mol)",
+                     "deltaS": "Entropy (ΔS, J/mol·K)", "qmax": "Maximum Adsorption (qmax)"}
+
+def store_selection(sim, paths, free, key):
+    """
+    Pick one of the result stores `paths` and hold its axes outside `free` at slider values.
+
+    Returns the opened store and the chosen values; sliders start at the
+    axis values closest to the current simulation inputs.
+    """
+    path = st.selectbox("Result Store", paths, format_func=lambda path: path.name, key=f"{key}_store")
+    store = resultstore.ResultStore.open(path)
+    st.caption(f"{store.attrs.get('model', '?')} sweep over "
+               + " × ".join(f"{name} ({len(values)})" for name, values in store.axes.items()))
+    fixed = {}
+    for name, values in store.axes.items():
+        if name in free:
+            continue
+        options = values.tolist()
+        fixed[name] = st.select_slider(STORE_AXIS_LABELS.get(name, name), options,
+                                       value=options[store.index(name, sim[name])],
+                                       format_func=lambda value: f"{value:g}", key=f"{key}_{name}")
+    return store, fixed
 
 def app():
     st.title("Advanced Adsorption Simulation")
@@ -62,8 +108,7 @@ def app():
         deltaH = st.number_input("Enthalpy (ΔH, kJ/mol)", min_value=-200.0, max_value=0.0, value=-20.0, step=1.0,
                                  help="Negative for exothermic processes.")
         deltaS = st.number_input("Entropy (ΔS, J/mol·K)", min_value=-300.0, max_value=300.0, value=-60.0, step=1.0)
-        R = 8.314  # J/mol·K
-        K = np.exp((-deltaH * 1000) / (R * T) + deltaS / R)
+        K = equilibrium_constant(T, deltaH, deltaS)
         st.write(f"Calculated Equilibrium Constant (K): {K:.3f}")
         if model_type == "Freundlich":
             n = st.number_input("Freundlich Exponent (n)", min_value=0.1, max_value=10.0, value=2.0, step=0.1)
@@ -81,128 +126,180 @@ def app():
     # ============================================================
     # ADSORPTION ISOTHERM CALCULATION
     # ============================================================
-    pressure_points = 100
-    pressures = np.linspace(0, P_max, pressure_points)
-    
-    if model_type == "Langmuir":
-        # q = qmax * (K * p) / (1 + K * p)
-        Q = qmax * (K * pressures) / (1 + K * pressures)
-    elif model_type == "Freundlich":
-        # q = qmax * (K * p^(1/n)) / (1 + K * p^(1/n))
-        Q = qmax * (K * pressures**(1/n)) / (1 + K * pressures**(1/n))
-    elif model_type == "BET":
-        # Simplified BET model
-        Q = qmax * (C_BET * pressures) / ((1 - pressures / P_max) * (1 + (C_BET - 1) * pressures / P_max))
-    elif model_type == "Temkin":
-        Q = np.zeros_like(pressures)
-        positive = pressures > 0
-        Q[positive] = qmax * ((R * T / b) * np.log(K * pressures[positive])) / (1 + (R * T / b) * np.log(K * pressures[positive]))
-    else:
-        Q = np.zeros_like(pressures)
+    # Grid points are placed where the curve bends; tolerance is relative to its range.
+    grid_tol = 1e-3
+    sim_key = simulation_key(model_type, T=T, P_max=P_max, qmax=qmax, deltaH=deltaH, deltaS=deltaS,
+                             n=n, C=C_BET, b=b, tol=grid_tol)
+    with timed("isotherm"):
+        pressures, Q = cached("isotherm", sim_key,
+                              lambda: compute_isotherm(model_type, T, P_max, qmax, deltaH, deltaS,
+                                                       n, C_BET, b, grid_tol))
     
     # Apply material scaling (normalize to 1000 m²/g)
     scale = surface_area / 1000.0
-    Q_scaled = Q * scale
+    all_materials = predefined_materials.copy()
+    if adsorbent == "Custom":
+        all_materials["Custom"] = {"surface_area": surface_area, "pore_volume": pore_volume}
+    sim = {"model_type": model_type, "T": T, "P_max": P_max, "qmax": qmax, "deltaH": deltaH, "deltaS": deltaS,
+           "K": K, "n": n, "C_BET": C_BET, "b": b, "sim_key": sim_key, "pressures": pressures,
+           "Q_scaled": Q * scale, "scale": scale, "adsorbent": adsorbent}
 
-    # ============================================================
-    # PLOT: ADSORPTION ISOTHERM (SINGLE CURVE)
-    # ============================================================
+    # Each section is a fragment: its own widgets rerun only that section,
+    # reusing the inputs and isotherm computed above.
+    isotherm_section(sim)
+    material_section(sim, all_materials)
+    surface_section(sim)
+    export_section(sim)
+
+# ============================================================
+# PLOT: ADSORPTION ISOTHERM (SINGLE CURVE)
+# ============================================================
+@st.fragment
+@fragment_timer("isotherm")
+def isotherm_section(sim):
     st.header("Adsorption Isotherm")
-    fig_iso = go.Figure()
-    fig_iso.add_trace(go.Scatter(x=pressures, y=Q_scaled, mode='lines', name=f"{adsorbent}"))
+    with span("isotherm_figure", "plotly"):
+        fig_iso = go.Figure()
+        fig_iso.add_trace(go.Scatter(x=sim["pressures"], y=sim["Q_scaled"], mode='lines', name=f"{sim['adsorbent']}"))
+    measured_file = st.file_uploader("Overlay Measured Data (CSV or Parquet)", type=["csv", "parquet"])
+    if measured_file is not None:
+        # Parsed columns and the downsampled trace are cached by file content.
+        raw = measured_file.getvalue()
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        columns = cached("measured", (digest,),
+                         lambda: measurements.read_measurements(pa.BufferReader(raw), measured_file.name))
+        if len(columns) < 2:
+            st.error("The file needs at least two numeric columns (pressure and uptake).")
+        else:
+            measured_cols = st.columns(2)
+            p_col = measured_cols[0].selectbox("Measured Pressure Column", list(columns), index=0)
+            q_col = measured_cols[1].selectbox("Measured Uptake Column", list(columns), index=1)
+            with span("downsample_measured", "compute"):
+                key = (digest, p_col, q_col, measurements.PLOT_MAX_POINTS)
+                p_measured, q_measured = cached("measured_trace", key,
+                                                lambda: measurements.lttb(columns[p_col], columns[q_col]))
+            st.caption(f"Showing {len(p_measured):,} of {len(columns[p_col]):,} measured points.")
+            fig_iso.add_trace(go.Scatter(x=p_measured, y=q_measured, mode='markers', name=measured_file.name,
+                                         marker={"size": 4}))
+    # Isotherms of precomputed sweeps are read as one row of the memory-mapped store.
+    iso_stores = resultstore.list_stores(axes=("P",))
+    if iso_stores and st.checkbox("Overlay Isotherm From Result Store"):
+        store, fixed = store_selection(sim, iso_stores, ("P",), "iso")
+        with span("read_store_isotherm", "compute"):
+            p_store, q_store = store.isotherm(**fixed)
+            if len(p_store) > measurements.PLOT_MAX_POINTS:
+                p_store, q_store = measurements.lttb(p_store, q_store)
+        fig_iso.add_trace(go.Scatter(x=p_store, y=q_store * sim["scale"], mode='lines', line={"dash": "dash"},
+                                     name=f"{store.path.name} ({', '.join(f'{k}={v:g}' for k, v in fixed.items())})"))
     fig_iso.update_layout(title="Adsorption Isotherm",
                           xaxis_title="Pressure (bar)",
                           yaxis_title="Adsorption (mol/kg)")
-    st.plotly_chart(fig_iso, use_container_width=True)
-    
-    # ============================================================
-    # MATERIAL COMPARISON: OVERLAPPING CURVES FOR DIFFERENT MATERIALS
-    # ============================================================
+    with timed("figure_serialization"):
+        st.plotly_chart(fig_iso, use_container_width=True)
+
+# ============================================================
+# MATERIAL COMPARISON: OVERLAPPING CURVES FOR DIFFERENT MATERIALS
+# ============================================================
+@st.fragment
+@fragment_timer("materials")
+def material_section(sim, all_materials):
     st.header("Material Comparison")
-    all_materials = predefined_materials.copy()
-    if adsorbent == "Custom":
-        all_materials["Custom"] = {"surface_area": surface_area, "pore_volume": pore_volume}
-    fig_material = go.Figure()
-    for mat, props in all_materials.items():
-        scale_mat = props["surface_area"] / 1000.0
-        if model_type == "Langmuir":
-            Q_mat = qmax * (K * pressures) / (1 + K * pressures)
-        elif model_type == "Freundlich":
-            Q_mat = qmax * (K * pressures**(1/n)) / (1 + K * pressures**(1/n))
-        elif model_type == "BET":
-            Q_mat = qmax * (C_BET * pressures) / ((1 - pressures / P_max) * (1 + (C_BET - 1) * pressures / P_max))
-        elif model_type == "Temkin":
-            Q_mat = np.zeros_like(pressures)
-            positive = pressures > 0
-            Q_mat[positive] = qmax * ((R * T / b) * np.log(K * pressures[positive])) / (1 + (R * T / b) * np.log(K * pressures[positive]))
-        else:
-            Q_mat = np.zeros_like(pressures)
-        fig_material.add_trace(go.Scatter(x=pressures, y=Q_mat * scale_mat,
-                                          mode='lines', name=f"{mat} (scale: {scale_mat:.2f})"))
-    fig_material.update_layout(title="Material-Specific Adsorption Isotherms",
-                               xaxis_title="Pressure (bar)",
-                               yaxis_title="Adsorption (mol/kg)")
-    st.plotly_chart(fig_material, use_container_width=True)
-    
-    # ============================================================
-    # 3D VISUALIZATION WITH TIME RANGE SELECTION
-    # ============================================================
+    scales = np.array([props["surface_area"] for props in all_materials.values()]) / 1000.0
+    with timed("isotherm"):
+        Q_materials = cached("materials", sim["sim_key"] + (tuple(scales),),
+                             lambda: material_isotherms(sim["model_type"], sim["pressures"], scales, K=sim["K"],
+                                                        qmax=sim["qmax"], n=sim["n"], C=sim["C_BET"], b=sim["b"],
+                                                        T=sim["T"], p0=sim["P_max"]))
+    with span("material_figure", "plotly"):
+        fig_material = go.Figure()
+        for mat, scale_mat, Q_mat in zip(all_materials, scales, Q_materials):
+            fig_material.add_trace(go.Scatter(x=sim["pressures"], y=Q_mat,
+                                              mode='lines', name=f"{mat} (scale: {scale_mat:.2f})"))
+        fig_material.update_layout(title="Material-Specific Adsorption Isotherms",
+                                   xaxis_title="Pressure (bar)",
+                                   yaxis_title="Adsorption (mol/kg)")
+    with timed("figure_serialization"):
+        st.plotly_chart(fig_material, use_container_width=True)
+
+# ============================================================
+# 3D VISUALIZATION WITH TIME RANGE SELECTION
+# ============================================================
+@st.fragment
+@fragment_timer("surface")
+def surface_section(sim):
     st.header("3D Visualization")
-    if st.checkbox("Show 3D Plot"):
+    # The export section picks up the last surface built for the current parameters.
+    st.session_state["simulation_surface"] = None
+    if not st.checkbox("Show 3D Plot"):
+        return
+    surface_source = "Computed"
+    surface_stores = resultstore.list_stores(axes=("T", "P"))
+    if surface_stores:
+        surface_source = st.radio("Surface Source", ["Computed", "Result store"], horizontal=True)
+    if surface_source == "Result store":
+        # Only the decimated rows of the P x T slice are read from the memory-mapped store.
+        store, fixed = store_selection(sim, surface_stores, ("T", "P"), "surface")
+        with timed("surface"):
+            P_store, T_store, Z_store = store.surface(**fixed)
+            P_view, T_view, Z_view = decimate(P_store, T_store, Z_store)
+    else:
         # Ask for the temperature range only when the 3D plot is activated.
         temp_range_3d = st.slider("Select Temperature Range for 3D Plot (K)", 0, 1000, (273, 298))
+        resolution_3d = st.select_slider("Surface Resolution (points per axis)", [25, 50, 100, 200], value=50)
         
-        # Define ranges for pressure and temperature based on the selected temperature range.
-        P_range = np.linspace(0, P_max, 50)
-        T_range = np.linspace(temp_range_3d[0], temp_range_3d[1], 50)
-        
-        # Create the base surface using your provided function.
-        # Expected: create_3d_surface returns a NumPy array of adsorption values with shape (len(T_range), len(P_range))
-        surface = create_3d_surface(P_range, T_range, deltaH, deltaS)
-        
-        # Ensure that we have numeric data in a NumPy array for further arithmetic.
-        if isinstance(surface, go.Surface):
-            try:
-                z_data = np.array(surface.z)
-            except Exception as e:
-                st.error("Error extracting z data from surface: " + str(e))
-                z_data = np.zeros((len(T_range), len(P_range)))
-        elif not isinstance(surface, np.ndarray):
-            try:
-                z_data = np.array(surface)
-            except Exception as e:
-                st.error("Error converting surface to numpy array: " + str(e))
-                z_data = np.zeros((len(T_range), len(P_range)))
-        else:
-            z_data = surface
+        # The full-resolution surface is cached; only a decimated float32 copy is sent to the browser.
+        surface_key = sim["sim_key"] + (("T_range", temp_range_3d), ("resolution", resolution_3d))
+        with timed("surface"):
+            surface = cached("surface", surface_key,
+                             lambda: surface_data(sim["model_type"], sim["P_max"], temp_range_3d, sim["deltaH"],
+                                                  sim["deltaS"], sim["qmax"], resolution=resolution_3d,
+                                                  n=sim["n"], C=sim["C_BET"], b=sim["b"]))
+        st.session_state["simulation_surface"] = (sim["sim_key"], surface)
+        P_view, T_view, Z_view = decimate(surface["P"], surface["T"], surface["Z"])
 
-        # (Optional) Apply any additional modifications to z_data here.
-        # In this example, we simply use z_data as the 3D surface.
-        
-        # Create and display the 3D surface plot.
-        fig_3d = go.Figure(data=[go.Surface(z=z_data, x=P_range, y=T_range)])
+    # Create and display the 3D surface plot.
+    with span("surface_figure", "plotly"):
+        fig_3d = go.Figure(data=[go.Surface(z=Z_view * np.float32(sim["scale"]), x=P_view, y=T_view)])
         fig_3d.update_layout(
             scene=dict(xaxis_title="Pressure (bar)",
                     yaxis_title="Temperature (K)",
                     zaxis_title="Adsorption (mol/kg)"),
             title="3D Adsorption Surface"
         )
+    with timed("figure_serialization"):
         st.plotly_chart(fig_3d, use_container_width=True)
 
-    
-    # ============================================================
-    # EXPORT RESULTS
-    # ============================================================
+# ============================================================
+# EXPORT RESULTS
+# ============================================================
+@st.fragment
+@fragment_timer("export")
+def export_section(sim):
     st.header("Export Results")
-    if st.button("Generate CSV"):
-        import pandas as pd
-        results_df = pd.DataFrame({
-            'Pressure (bar)': pressures,
-            'Temperature (K)': [T] * len(pressures),
-            'Adsorption (mol/kg)': Q_scaled
-        })
-        st.markdown(get_download_link(results_df, 'adsorption_results.csv', 'Download Results CSV'),
-                    unsafe_allow_html=True)
+    # Results are only serialized when a download is requested.
+    export_format = st.selectbox("Export Format", list(export.FORMATS))
+    extension = export.FORMATS[export_format]["extension"]
+    if st.button("Prepare Isotherm Download"):
+        with timed("export"):
+            data = export.export_bytes(export.column_batches({
+                'Pressure (bar)': sim["pressures"],
+                'Temperature (K)': float(sim["T"]),
+                'Adsorption (mol/kg)': sim["Q_scaled"]
+            }), export_format)
+        st.download_button("Download Results", data, file_name=f"adsorption_results.{extension}",
+                           mime=export.FORMATS[export_format]["mime"])
+    if st.button("Prepare 3D Surface Download"):
+        built = st.session_state.get("simulation_surface")
+        if built is None or built[0] != sim["sim_key"]:
+            st.info("Show the 3D plot first to build the surface.")
+        else:
+            surface = built[1]
+            with timed("export"):
+                data = export.export_bytes(export.grid_batches(surface["P"], surface["T"], surface["Z"],
+                                                 ('Pressure (bar)', 'Temperature (K)', 'Adsorption (mol/kg)'),
+                                                 scale=sim["scale"]), export_format)
+            st.download_button("Download Surface", data, file_name=f"adsorption_surface.{extension}",
+                               mime=export.FORMATS[export_format]["mime"])
 
 if __name__ == '__main__':
-    app()
+    app()
\ No newline at end of file
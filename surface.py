@@ -0,0 +1,74 @@
+import numpy as np
+from grids import BET_CUTOFF
+from isotherms import isotherm
+from simcache import cached, simulation_key
+from thermo import equilibrium_constant, k_table
+from tracing import traced
+
+# Largest grid sent to the browser per axis; the full grid stays server-side.
+DISPLAY_MAX_POINTS = 60
+
+
+def surface_grid(model: str, P_range: np.ndarray, T_range: np.ndarray, deltaH: float, deltaS: float,
+                 qmax: float = 1.0, *, n: float = 2.0, C: float = 10.0, b: float = 100.0,
+                 p0: float | None = None, K: np.ndarray | None = None, dtype=np.float64) -> np.ndarray:
+    """
+    Adsorption over a temperature x pressure grid as a raw array.
+
+    K only varies along the temperature axis, so it is computed once per
+    temperature and broadcast against the pressure axis instead of on a full
+    meshgrid; a precomputed K per temperature can be passed as `K`. Returns an
+    array of shape (len(T_range), len(P_range)) in the requested dtype.
+    """
+    P = np.asarray(P_range, dtype=float)[None, :]
+    T = np.asarray(T_range, dtype=float)[:, None]
+    K = equilibrium_constant(T, deltaH, deltaS) if K is None else np.asarray(K, dtype=float).reshape(T.shape)
+    out = np.empty((T.shape[0], P.shape[1]), dtype=dtype)
+    p0 = P.max() if p0 is None else p0
+    with np.errstate(over="ignore", divide="ignore"):
+        return isotherm(model, P, K, qmax, n=n, C=C, b=b, T=T, p0=p0, out=out)
+
+
+def cached_k_table(T_min: float, T_max: float, points: int, deltaH: float, deltaS: float) -> dict:
+    """
+    `thermo.k_table` cached per parameter set; the read-only arrays are shared by every caller.
+    """
+    key = simulation_key("van't Hoff", T_min=T_min, T_max=T_max, points=int(points),
+                         deltaH=deltaH, deltaS=deltaS)
+    return cached("k_table", key, lambda: k_table(T_min, T_max, points, deltaH, deltaS))
+
+
+def decimate(P_range: np.ndarray, T_range: np.ndarray, Z: np.ndarray,
+             max_points: int = DISPLAY_MAX_POINTS) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Thin a surface to at most `max_points` per axis, keeping both end points.
+
+    Returns views where possible, so no copy is made when no thinning is needed.
+    """
+    def axis_index(size):
+        if size <= max_points:
+            return slice(None)
+        return np.unique(np.linspace(0, size - 1, max_points).round().astype(int))
+
+    rows, cols = axis_index(len(T_range)), axis_index(len(P_range))
+    return P_range[cols], T_range[rows], Z[rows][:, cols]
+
+
+@traced()
+def surface_data(model: str, P_max: float, T_limits: tuple, deltaH: float, deltaS: float,
+                 qmax: float = 1.0, *, resolution: int = 50, dtype=np.float32, **params) -> dict:
+    """
+    Full-resolution surface for a pressure range [0, P_max] and temperature limits.
+
+    For BET the pressure axis stops at grids.BET_CUTOFF * P_max, short of the p0 = P_max singularity.
+    Returns a dict with the axes "P", "T" and the adsorption grid "Z".
+    """
+    p_end = P_max * (BET_CUTOFF if model == "BET" else 1.0)
+    P_range = np.linspace(0, p_end, resolution, dtype=dtype)
+    T_range = np.linspace(T_limits[0], T_limits[1], resolution, dtype=dtype)
+    params.setdefault("p0", P_max)
+    # The K(T) table only depends on the temperature axis, so it is shared
+    # between models, pressures and capacities.
+    K = cached_k_table(T_limits[0], T_limits[1], resolution, deltaH, deltaS)["K"]
+    Z = surface_grid(model, P_range, T_range, deltaH, deltaS, qmax, K=K, dtype=dtype, **params)
+    return {"P": P_range, "T": T_range, "Z": Z}
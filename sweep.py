@@ -0,0 +1,245 @@
+"""
+Multi-dimensional parameter sweeps in a shared-memory process pool.
+
+The sweep grid spans any of the axes T, ΔH, ΔS and qmax plus the pressure
+axis, which is always last so every grid row is one isotherm. The output
+array lives in `multiprocessing.shared_memory`; the rows are partitioned into
+blocks and each worker process writes its block straight into that array,
+so no result data is pickled back to the parent. Progress is reported per
+finished block and a sweep can be cancelled between blocks:
+
+    python sweep.py Langmuir --T 250:400:100 --deltaH=-40:-10:50 --deltaS=-100:-20:50 --P 0:10:400 -o scan.npy
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from isotherms import MODELS, isotherm
+from thermo import equilibrium_constant
+
+# Grid axes in output order; pressure is last so that each row is one isotherm.
+SWEEP_AXES = ("T", "deltaH", "deltaS", "qmax", "P")
+DEFAULTS = {"T": 298.0, "deltaH": -20.0, "deltaS": -60.0, "qmax": 10.0}
+BLOCK_POINTS = 2_000_000  # target grid points per worker task
+
+
+class SweepCancelled(Exception):
+    """
+    Raised when a sweep is cancelled before all blocks have been evaluated.
+    """
+
+
+class SharedSweep:
+    """
+    Sweep result backed by shared memory.
+
+    `values` is a view on the shared block with one dimension per entry of
+    `axes`. Call `close()` (or use the object as a context manager) to release
+    the shared memory once the values are no longer needed.
+    """
+
+    def __init__(self, axes: dict, dtype):
+        self.axes = axes
+        self.shape = tuple(len(values) for values in axes.values())
+        size = max(int(np.prod(self.shape)) * np.dtype(dtype).itemsize, 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.values = np.ndarray(self.shape, dtype=dtype, buffer=self.shm.buf)
+
+    def close(self):
+        self.values = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+_worker = {}
+
+
+def _attach(target, shape, dtype, axes, fixed, model, params):
+    """
+    Worker initializer: map the output array once per process.
+
+    `target` is ("shm", name) for a shared memory block or ("memmap", path)
+    for a raw array file on disk.
+    """
+    kind, location = target
+    if kind == "shm":
+        shm = shared_memory.SharedMemory(name=location)
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    else:
+        shm = None
+        out = np.memmap(location, dtype=dtype, mode="r+", shape=shape)
+    _worker.update(shm=shm, out=out, axes=axes, fixed=fixed, model=model, params=params)
+
+
+def _evaluate_rows(start: int, stop: int, out=None, axes=None, fixed=None, model=None, params=None) -> int:
+    """
+    Evaluate grid rows [start, stop) into the output array and return the row count.
+    """
+    out = _worker["out"] if out is None else out
+    axes = _worker["axes"] if axes is None else axes
+    fixed = _worker["fixed"] if fixed is None else fixed
+    model = _worker["model"] if model is None else model
+    params = _worker["params"] if params is None else params
+
+    rows = out.reshape(-1, out.shape[-1])
+    values = dict(fixed)
+    if out.ndim > 1:
+        index = np.unravel_index(np.arange(start, stop), out.shape[:-1])
+        for name, idx in zip(list(axes)[:-1], index):
+            values[name] = axes[name][idx][:, None]
+    T = np.broadcast_to(values["T"], (stop - start, 1))
+    K = equilibrium_constant(T, values["deltaH"], values["deltaS"])
+    isotherm(model, axes["P"][None, :], K, values["qmax"], T=T, out=rows[start:stop], **params)
+    return stop - start
+
+
+def sweep_grid(model: str, axes: dict, *, workers: int | None = None, dtype=np.float32,
+               block_points: int = BLOCK_POINTS, progress=None, cancel: threading.Event | None = None,
+               **params) -> SharedSweep:
+    """
+    Evaluate an isotherm model over the Cartesian grid of `axes`.
+
+    `axes` maps names from SWEEP_AXES to 1-D arrays and must contain "P";
+    axes that are left out are held at a keyword of the same name or at
+    their DEFAULTS value. Model constants (n, C, b, p0) are passed as keywords.
+    `progress(done_points, total_points)` is called after every block, and
+    setting `cancel` stops the sweep between blocks with SweepCancelled.
+    With `workers` == 1 the grid is evaluated in-process.
+    """
+    ordered, fixed, params = prepare_sweep(model, axes, params)
+    result = SharedSweep(ordered, dtype)
+    try:
+        run_blocks(("shm", result.shm.name), result.values, ordered, fixed, model, params, workers=workers,
+                   block_points=block_points, progress=progress, cancel=cancel)
+    except BaseException:
+        result.close()
+        raise
+    return result
+
+
+def prepare_sweep(model: str, axes: dict, params: dict) -> tuple[dict, dict, dict]:
+    """
+    Validate a sweep and split it into ordered grid axes, fixed values and model constants.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown isotherm model: {model!r}")
+    unknown = set(axes) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Unknown sweep axes: {sorted(unknown)}")
+    if "P" not in axes:
+        raise ValueError("The sweep needs a pressure axis 'P'")
+    params = dict(params)
+    fixed = {name: float(params.pop(name, value)) for name, value in DEFAULTS.items()}
+    ordered = {name: np.asarray(axes[name], dtype=float).ravel() for name in SWEEP_AXES if name in axes}
+    if "p0" not in params and model == "BET":
+        params["p0"] = float(ordered["P"].max())
+    return ordered, fixed, params
+
+
+def run_blocks(target, out: np.ndarray, axes: dict, fixed: dict, model: str, params: dict, *,
+               workers: int | None, block_points: int, progress, cancel):
+    """
+    Fill `out` block by block, in-process or in a pool whose workers map `target`.
+    """
+    n_rows = int(np.prod(out.shape[:-1]))
+    row_points = out.shape[-1]
+    block_rows = max(1, block_points // max(row_points, 1))
+    blocks = [(start, min(start + block_rows, n_rows)) for start in range(0, n_rows, block_rows)]
+    total = n_rows * row_points
+    done = 0
+
+    if workers == 1 or len(blocks) == 1:
+        for start, stop in blocks:
+            if cancel is not None and cancel.is_set():
+                raise SweepCancelled(f"Cancelled after {done} of {total} points")
+            done += _evaluate_rows(start, stop, out, axes, fixed, model, params) * row_points
+            if progress:
+                progress(done, total)
+        return
+
+    init_args = (target, out.shape, out.dtype, axes, fixed, model, params)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=init_args) as pool:
+        pending = {pool.submit(_evaluate_rows, start, stop) for start, stop in blocks}
+        while pending:
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done += future.result() * row_points
+            if finished and progress:
+                progress(done, total)
+            if cancel is not None and cancel.is_set():
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                raise SweepCancelled(f"Cancelled after {done} of {total} points")
+
+
+def parse_axis(spec: str) -> np.ndarray:
+    """
+    Parse "start:stop:count" (inclusive linspace) or a comma-separated list of values.
+    """
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(value) for value in spec.split(",")])
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the model, axis, model constant and worker options shared by the sweep CLIs.
+    """
+    parser.add_argument("model", choices=MODELS)
+    for name in SWEEP_AXES:
+        parser.add_argument(f"--{name}", help="start:stop:count or comma-separated values")
+    parser.add_argument("--n", type=float, default=2.0, help="Freundlich exponent")
+    parser.add_argument("--C", type=float, default=10.0, help="BET constant")
+    parser.add_argument("--b", type=float, default=100.0, help="Temkin constant")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (1 = in-process)")
+
+
+def sweep_from_args(parser: argparse.ArgumentParser, args) -> tuple[dict, dict]:
+    """
+    The grid axes and model constants of parsed `add_sweep_arguments` options.
+    """
+    if args.P is None:
+        parser.error("--P is required")
+    axes = {name: parse_axis(getattr(args, name)) for name in SWEEP_AXES if getattr(args, name) is not None}
+    return axes, {"n": args.n, "C": args.C, "b": args.b}
+
+
+def print_progress(done: int, total: int):
+    """
+    Progress callback that keeps one status line updated on stdout.
+    """
+    print(f"\r{done / total:6.1%} of {total:,} points", end="", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate an isotherm over a multi-dimensional parameter grid.")
+    add_sweep_arguments(parser)
+    parser.add_argument("-o", "--output", help="Write the result grid to this .npy file")
+    args = parser.parse_args(argv)
+    axes, constants = sweep_from_args(parser, args)
+    start = time.perf_counter()
+
+    with sweep_grid(args.model, axes, workers=args.workers, progress=print_progress, **constants) as result:
+        elapsed = time.perf_counter() - start
+        print(f"\nEvaluated grid {result.shape} in {elapsed:.2f} s")
+        if args.output:
+            np.save(args.output, result.values)
+            print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Adsorption thermodynamics shared by the simulation pages and engines.
+
+The equilibrium constant follows the van't Hoff relation
+
+    K(T) = exp(-ΔH / (R T) + ΔS / R)
+
+with ΔH in kJ/mol and ΔS in J/(mol K). All functions broadcast over arrays
+of T, ΔH and ΔS, so a whole temperature sweep or parameter batch is a single
+call.
+"""
+import numpy as np
+
+R = 8.314  # J/mol·K
+
+
+def ln_equilibrium_constant(T, deltaH, deltaS) -> np.ndarray:
+    """
+    ln K = -ΔH·1000 / (R T) + ΔS / R.
+    """
+    T = np.asarray(T, dtype=float)
+    return (-np.asarray(deltaH, dtype=float) * 1000) / (R * T) + np.asarray(deltaS, dtype=float) / R
+
+
+def equilibrium_constant(T, deltaH, deltaS) -> np.ndarray:
+    """
+    Van't Hoff equilibrium constant K(T) for enthalpy ΔH and entropy ΔS.
+    """
+    return np.exp(ln_equilibrium_constant(T, deltaH, deltaS))
+
+
+def dlnK_dT(T, deltaH) -> np.ndarray:
+    """
+    Temperature derivative of ln K: ΔH·1000 / (R T²).
+    """
+    T = np.asarray(T, dtype=float)
+    return np.asarray(deltaH, dtype=float) * 1000 / (R * T**2)
+
+
+def dK_dT(T, deltaH, deltaS) -> np.ndarray:
+    """
+    Temperature derivative of K: K · ΔH·1000 / (R T²).
+    """
+    return equilibrium_constant(T, deltaH, deltaS) * dlnK_dT(T, deltaH)
+
+
+def vant_hoff(K_ref, T, deltaH, T_ref: float = 298.15) -> np.ndarray:
+    """
+    Shift a constant known at T_ref to T: K_ref · exp(-ΔH·1000/R · (1/T - 1/T_ref)).
+    """
+    T = np.asarray(T, dtype=float)
+    return K_ref * np.exp(-np.asarray(deltaH, dtype=float) * 1000 / R * (1 / T - 1 / T_ref))
+
+
+def k_table(T_min: float, T_max: float, points: int, deltaH: float, deltaS: float) -> dict:
+    """
+    K(T) on an evenly spaced temperature axis.
+
+    Returns arrays "T", "K", "lnK" and "dK_dT" of length `points`.
+    """
+    T = np.linspace(T_min, T_max, points)
+    lnK = ln_equilibrium_constant(T, deltaH, deltaS)
+    K = np.exp(lnK)
+    return {"T": T, "K": K, "lnK": lnK, "dK_dT": K * dlnK_dT(T, deltaH)}
@@ -0,0 +1,163 @@
+"""
+Opt-in rerun profiler writing Chrome Trace Event JSON.
+
+A trace records nested timing spans for the compute and render steps of one
+Streamlit rerun. The resulting file opens in chrome://tracing or
+https://ui.perfetto.dev. Tracing is enabled for every rerun with the
+environment variable TRACE_RERUNS=1 or per session with the sidebar toggle;
+files go to TRACE_DIR (default "traces"), which keeps the newest TRACE_KEEP
+files. Page sections that rerun on their own (st.fragment) are recorded as
+traces of their own through `fragment_trace`.
+
+When no trace is being recorded, `span` returns a shared no-op context
+manager and `traced` functions call straight through, so instrumented code
+costs one context-variable lookup per span.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+TRACE_RERUNS = os.environ.get("TRACE_RERUNS") == "1"
+TRACE_DIR = Path(os.environ.get("TRACE_DIR", "traces"))
+TRACE_KEEP = int(os.environ.get("TRACE_KEEP", "200"))  # newest trace files kept in TRACE_DIR; 0 keeps all
+TRACE_TOGGLE_KEY = "record_trace"  # session state key of the sidebar toggle
+
+_current = contextvars.ContextVar("trace", default=None)
+_NO_SPAN = nullcontext()
+
+
+class Trace:
+    """
+    Complete ("X") trace events of one rerun, timed relative to its start.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.events = []
+        self.path = None
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int, args: dict | None = None):
+        event = {"name": name, "cat": category, "ph": "X", "pid": self._pid, "tid": self._tid,
+                 "ts": (start_ns - self._origin) / 1000, "dur": (end_ns - start_ns) / 1000}
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        self.events.append(event)
+
+    def to_json(self) -> str:
+        return json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms",
+                           "otherData": {"rerun": self.name}})
+
+
+class _Span:
+    __slots__ = ("trace", "name", "category", "args", "start")
+
+    def __init__(self, trace, name, category, args):
+        self.trace, self.name, self.category, self.args = trace, name, category, args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, self.category, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    Context manager timing a block as a span of the current trace, if any.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name, category, args)
+
+
+def traced(name: str | None = None, category: str = "compute"):
+    """
+    Decorator recording every call of a function as a span.
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, label, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def record(name: str, directory: Path | None = None):
+    """
+    Record a trace of the enclosed rerun and write it to `directory` on exit.
+
+    Yields the Trace; its `path` is set once the file has been written.
+    """
+    trace = Trace(name)
+    token = _current.set(trace)
+    start = time.perf_counter_ns()
+    try:
+        yield trace
+    finally:
+        trace.add(name, "rerun", start, time.perf_counter_ns())
+        _current.reset(token)
+        directory = TRACE_DIR if directory is None else Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now / 1e9))
+        slug = "".join(ch if ch.isalnum() else "-" for ch in name.lower())
+        trace.path = directory / f"{stamp}.{now // 1000 % 10**6:06d}-{slug}.json"
+        trace.path.write_text(trace.to_json(), encoding="utf-8")
+        _prune(directory, TRACE_KEEP)
+
+
+def _prune(directory: Path, keep: int):
+    """
+    Delete all but the newest `keep` trace files; names start with their timestamp.
+    """
+    if keep <= 0:
+        return
+    for path in sorted(directory.glob("*.json"))[:-keep]:
+        path.unlink(missing_ok=True)
+
+
+def tracing_enabled() -> bool:
+    """
+    Whether reruns of the current session are traced (TRACE_RERUNS or the sidebar toggle).
+    """
+    if TRACE_RERUNS:
+        return True
+    import streamlit as st
+    return bool(st.session_state.get(TRACE_TOGGLE_KEY, False))
+
+
+@contextmanager
+def fragment_trace(name: str):
+    """
+    Trace a fragment run: a span of the enclosing rerun's trace, or a trace of its own.
+
+    A fragment that reruns by itself runs outside the entrypoint's `record`,
+    so when tracing is enabled it records and writes its own trace.
+    """
+    trace = _current.get()
+    if trace is not None:
+        with _Span(trace, name, "fragment", None):
+            yield
+    elif tracing_enabled():
+        with record(name):
+            yield
+    else:
+        yield